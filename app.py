@@ -5,18 +5,42 @@ A lightweight web interface for managing Gmail emails.
 """
 
 import os
+import json
+import time
+import queue
+import atexit
 import asyncio
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Optional
+from datetime import datetime
+from functools import lru_cache
+from collections import OrderedDict, deque
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, asdict
 from concurrent.futures import ThreadPoolExecutor
 
+import httpx
 from fastapi import FastAPI, Request, Form, Query, BackgroundTasks
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 
-from gmail_client import GmailClient, one_click_unsubscribe, async_one_click_unsubscribe, send_unsubscribe_email
+# Selenium is only needed for the browser fallback, so it is optional
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from webdriver_manager.chrome import ChromeDriverManager
+except ImportError:
+    webdriver = None
+
+from gmail_client import (
+    GmailClient, one_click_unsubscribe, async_one_click_unsubscribe,
+    async_form_unsubscribe, send_unsubscribe_email
+)
 from database import EmailDatabase, init_db
 from jobs import JobManager, Job, JobItem
 
@@ -28,6 +52,8 @@ DB_PATH = os.getenv("DB_PATH", None)  # If set, overrides default in database.py
 # Parallel processing configuration
 MAX_CONCURRENT_HTTP = int(os.getenv("MAX_CONCURRENT_HTTP", "5"))
 MAX_BROWSER_WORKERS = int(os.getenv("MAX_BROWSER_WORKERS", "3"))
+MAX_BLOCKING_THREADS = int(os.getenv("MAX_BLOCKING_THREADS", "8"))
+MAX_MAILTO_WORKERS = int(os.getenv("MAX_MAILTO_WORKERS", "3"))
 
 PROJECT_DIR = Path(__file__).parent
 
@@ -39,64 +65,257 @@ gmail = GmailClient()
 db = EmailDatabase()
 job_manager = JobManager()
 
-# Sync state
-sync_status = {"running": False, "progress": 0, "total": 0, "message": ""}
+# Emails buffered by do_sync before each save_emails transaction
+SYNC_WRITE_BATCH = 500
+
+# Job item status updates are written in batches of this size, this often
+JOB_UPDATE_BATCH = 50
+JOB_UPDATE_INTERVAL = 0.25
+
+# Shared HTTP client for one-click unsubscribes (created in lifespan)
+http_client: Optional[httpx.AsyncClient] = None
+
+# Shared thread pool for browser workers, reused across unsubscribe runs
+_BROWSER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_BROWSER_WORKERS, thread_name_prefix="unsub-browser"
+)
+atexit.register(_BROWSER_EXECUTOR.shutdown, wait=False)
+
+# Unsubscribe/confirm controls, combined so a page needs one find_elements call
+UNSUBSCRIBE_BUTTON_XPATH = " | ".join([
+    "//button[contains(translate(., 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
+    "//input[@type='submit'][contains(translate(@value, 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
+    "//a[contains(translate(., 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
+    "//button[contains(translate(., 'CONFIRM', 'confirm'), 'confirm')]",
+])
+
+# ChromeDriver path, resolved once and shared by all browser workers
+_CHROMEDRIVER_PATH: Optional[str] = None
+_CHROMEDRIVER_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class SyncStatus:
+    """Progress of the background Gmail sync."""
+    running: bool = False
+    progress: int = 0
+    total: int = 0
+    message: str = ""
+
+
+@dataclass(slots=True)
+class UnsubStatus:
+    """Progress of the current mass unsubscribe run."""
+    running: bool = False
+    progress: int = 0
+    total: int = 0
+    # One slot per item, filled with {sender, success, method, message} when it finishes
+    results: list = field(default_factory=list)
+    job_id: Optional[str] = None  # Current job ID
+
+    def start(self, total: int, job_id: Optional[str] = None) -> None:
+        """Reset in place for a new run."""
+        self.running = True
+        self.progress = 0
+        self.total = total
+        self.results = [None] * total
+        self.job_id = job_id
+
+    def finished_results(self) -> list[dict]:
+        """Results of the items that have finished so far."""
+        return [r for r in self.results if r is not None]
+
+    def snapshot(self) -> dict:
+        """Status as a plain dict for the API."""
+        return {
+            "running": self.running,
+            "progress": self.progress,
+            "total": self.total,
+            "results": self.finished_results(),
+            "job_id": self.job_id
+        }
+
+
+# One event per open /api/unsub-events stream, set whenever unsubscribe
+# progress changes. Each stream clears its own event, so no wakeup is lost
+# while it is busy; the version tells it whether anything actually changed.
+_unsub_listeners: set[asyncio.Event] = set()
+_unsub_version = 0
+UNSUB_EVENTS_KEEPALIVE = 15.0
+
+# Pending mailto unsubscribes: (mailto, future resolved with (success, message))
+_mailto_queue: asyncio.Queue = asyncio.Queue()
+
+# Email IDs viewed but not yet marked read in Gmail (flushed in batches)
+MARK_READ_INTERVAL = 0.5
+_mark_read_queue: set[str] = set()
+
+# Inbox counts, reused for a few seconds: category -> (count, monotonic time)
+COUNT_CACHE_TTL = 10.0
+_count_cache: dict[Optional[str], tuple[int, float]] = {}
+
+# Promotions sender pages by (page, search), valid while the version matches _senders_version.
+# Least recently used pages are evicted beyond SENDERS_CACHE_MAX, since every search is a new key
+SENDERS_PAGE_SIZE = 50
+SENDERS_CACHE_MAX = 32
+_senders_version = 0
+_senders_cache: tuple[int, OrderedDict] = (-1, OrderedDict())
+
+# Sync state (single instance, mutated in place)
+sync_status = SyncStatus()
 
 # Unsubscribe state (kept for backwards compatibility, now backed by DB)
-unsub_status = {
-    "running": False,
-    "progress": 0,
-    "total": 0,
-    "results": [],  # List of {sender, success, method, message}
-    "job_id": None,  # Current job ID
-}
+unsub_status = UnsubStatus()
+
+
+async def flush_mark_read() -> None:
+    """Mark queued emails as read, one batched Gmail call per interval."""
+    while True:
+        await asyncio.sleep(MARK_READ_INTERVAL)
+        if not _mark_read_queue or not gmail.service:
+            continue
+
+        batch = list(_mark_read_queue)
+        _mark_read_queue.clear()
+        try:
+            await asyncio.to_thread(gmail.mark_as_read, batch)
+        except Exception as e:
+            print(f"Mark as read error: {e}")
+
+
+async def mailto_worker() -> None:
+    """Send queued mailto unsubscribes through Gmail on a worker thread."""
+    while True:
+        mailto, future = await _mailto_queue.get()
+        try:
+            result = await asyncio.to_thread(send_unsubscribe_email, mailto, gmail.service)
+        except Exception as e:
+            result = (False, f"Email failed: {str(e)[:30]}")
+        if not future.done():
+            future.set_result(result)
+        _mailto_queue.task_done()
+
+
+def notify_unsub_update() -> None:
+    """Wake every /api/unsub-events stream waiting for a progress change."""
+    global _unsub_version
+    _unsub_version += 1
+    for listener in _unsub_listeners:
+        listener.set()
+
+
+async def queue_unsubscribe_email(mailto: str) -> tuple[bool, str]:
+    """Hand a mailto unsubscribe to the send workers and wait for its result."""
+    future = asyncio.get_running_loop().create_future()
+    await _mailto_queue.put((mailto, future))
+    return await future
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - authenticate on startup."""
+    global http_client
+    # Bounded pool for blocking Gmail API calls made via asyncio.to_thread
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=MAX_BLOCKING_THREADS)
+    )
+    await db.open()
+    await job_manager.open()
     try:
         gmail.authenticate()
+        app.state.gmail_authenticated = True
         print("Gmail authenticated successfully!")
     except Exception as e:
         print(f"Gmail auth failed: {e}")
         print("Please ensure credentials.json is present.")
-    yield
+
+    # Pooled keep-alive connections (HTTP/2 where supported) for unsubscribe POSTs
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=MAX_CONCURRENT_HTTP * 2,
+            max_keepalive_connections=MAX_CONCURRENT_HTTP
+        ),
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        follow_redirects=True
+    )
+    background = [asyncio.create_task(flush_mark_read())]
+    background.extend(
+        asyncio.create_task(mailto_worker()) for _ in range(MAX_MAILTO_WORKERS)
+    )
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        await http_client.aclose()
+        http_client = None
+        await asyncio.to_thread(browser_pool.shutdown)
+        await job_manager.close()
+        await db.close()
 
 
 app = FastAPI(title="Gmail Client", lifespan=lifespan)
+# Set by lifespan once authentication succeeds; read by /health
+app.state.gmail_authenticated = False
 
 # Templates
 templates = Jinja2Templates(directory=str(PROJECT_DIR / "templates"))
 
 
 # Custom template filters
+DATE_FORMAT = "%b %d, %Y"
+DATETIME_FORMAT = "%b %d, %Y at %I:%M %p"
+
+
+@lru_cache(maxsize=4096)
+def _format_iso(value: str, fmt: str) -> str:
+    """Format an ISO date string (cached - the same dates repeat across rows)."""
+    try:
+        return datetime.fromisoformat(value).strftime(fmt)
+    except ValueError:
+        return value
+
+
 def format_date(value):
     """Format date for display."""
     if isinstance(value, str):
-        from datetime import datetime
-        try:
-            value = datetime.fromisoformat(value)
-        except:
-            return value
-    return value.strftime("%b %d, %Y")
+        return _format_iso(value, DATE_FORMAT)
+    return value.strftime(DATE_FORMAT)
 
 
 def format_datetime(value):
     """Format datetime for display."""
     if isinstance(value, str):
-        from datetime import datetime
-        try:
-            value = datetime.fromisoformat(value)
-        except:
-            return value
-    return value.strftime("%b %d, %Y at %I:%M %p")
+        return _format_iso(value, DATETIME_FORMAT)
+    return value.strftime(DATETIME_FORMAT)
 
 
 templates.env.filters["format_date"] = format_date
 templates.env.filters["format_datetime"] = format_datetime
 
 
+# Compile each page template once at import and reuse it for every request
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+_page_templates = {
+    name: templates.get_template(name)
+    for name in ("inbox.html", "email.html", "unsubscribe.html")
+}
+
+
+def render_template(name: str, context: dict) -> HTMLResponse:
+    """Render a pre-compiled page template."""
+    return HTMLResponse(_page_templates[name].render(context))
+
+
+def stream_template(name: str, context: dict) -> StreamingResponse:
+    """Render a pre-compiled template incrementally, sending chunks as they are produced."""
+    stream = _page_templates[name].stream(context)
+    # Group small template fragments so each send carries a useful amount
+    stream.enable_buffering(size=8)
+    return StreamingResponse(stream, media_type="text/html")
+
+
 # Routes
 
 @app.get("/health")
@@ -105,7 +324,7 @@ async def health_check():
     return JSONResponse({
         "status": "ok",
         "service": "gmail-unsubscribe",
-        "gmail_authenticated": gmail.service is not None
+        "gmail_authenticated": app.state.gmail_authenticated
     })
 
 
@@ -120,23 +339,40 @@ async def inbox(
     request: Request,
     category: str = "all",
     page: int = 1,
-    q: Optional[str] = None
+    q: Optional[str] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None
 ):
     """Display email inbox."""
     limit = 50
-    offset = (page - 1) * limit
-
-    emails = await db.get_emails(
-        category=category,
-        limit=limit,
-        offset=offset,
-        search=q
-    )
-
-    total = await db.get_count(category=category if not q else None)
+    after_key = parse_page_cursor(after)
+    before_key = parse_page_cursor(before)
+    # Offset only for cursor-less links (e.g. bookmarked ?page=N)
+    offset = 0 if after_key or before_key else (page - 1) * limit
+
+    # Searches count their matches in the same query; plain listings use
+    # the trigger-maintained per-category counts
+    if q:
+        emails, total = await db.search_emails_with_total(
+            q,
+            category=category,
+            limit=limit,
+            offset=offset,
+            after=after_key,
+            before=before_key
+        )
+    else:
+        emails = await db.get_emails(
+            category=category,
+            limit=limit,
+            offset=offset,
+            after=after_key,
+            before=before_key
+        )
+        total = await cached_count(category)
     total_pages = (total + limit - 1) // limit
 
-    return templates.TemplateResponse("inbox.html", {
+    return stream_template("inbox.html", {
         "request": request,
         "emails": emails,
         "category": category,
@@ -144,65 +380,105 @@ async def inbox(
         "total_pages": total_pages,
         "total": total,
         "search": q,
+        "next_cursor": page_cursor(emails[-1]) if emails else None,
+        "prev_cursor": page_cursor(emails[0]) if emails else None,
         "sync_status": sync_status
     })
 
 
+def page_cursor(email: dict) -> str:
+    """Keyset cursor for paging past an email row."""
+    return f"{email['date']}_{email['id']}"
+
+
+def parse_page_cursor(value: Optional[str]) -> Optional[tuple[str, str]]:
+    """Split a page_cursor value back into (date, id)."""
+    if not value:
+        return None
+    date, sep, email_id = value.rpartition('_')
+    return (date, email_id) if sep and date and email_id else None
+
+
+def invalidate_email_caches() -> None:
+    """Drop cached counts and sender lists after the emails table changes."""
+    global _senders_version
+    _count_cache.clear()
+    _senders_version += 1
+
+
+async def cached_count(category: Optional[str]) -> int:
+    """Get the email count for a category, reusing a recent result."""
+    now = time.monotonic()
+    cached = _count_cache.get(category)
+    if cached and now - cached[1] < COUNT_CACHE_TTL:
+        return cached[0]
+
+    count = await db.get_count(category=category)
+    _count_cache[category] = (count, now)
+    return count
+
+
 @app.get("/email/{email_id}", response_class=HTMLResponse)
 async def view_email(request: Request, email_id: str):
     """View single email."""
     # Get from cache first
     email = await db.get_email(email_id)
 
-    # Fetch full content from Gmail if needed
-    full_email = gmail.get_email(email_id, include_body=True)
-
-    if full_email:
-        # Update cache
-        await db.save_email(full_email)
-        email = {
-            "id": full_email.id,
-            "subject": full_email.subject,
-            "sender": full_email.sender,
-            "sender_email": full_email.sender_email,
-            "date": full_email.date.isoformat(),
-            "body_html": full_email.body_html,
-            "body_text": full_email.body_text,
-            "unsubscribe_url": full_email.unsubscribe_url,
-            "labels": full_email.labels,
-            "category": full_email.category
-        }
-
-        # Mark as read
-        gmail.mark_as_read([email_id])
+    # Fetch full content from Gmail only if the body isn't cached yet
+    if not (email and (email.get("body_html") or email.get("body_text"))):
+        full_email = await asyncio.to_thread(gmail.get_email, email_id, True)
+
+        if full_email:
+            # Update cache
+            await db.save_email(full_email)
+            invalidate_email_caches()
+            email = {
+                "id": full_email.id,
+                "subject": full_email.subject,
+                "sender": full_email.sender,
+                "sender_email": full_email.sender_email,
+                "date": full_email.date.isoformat(),
+                "body_html": full_email.body_html,
+                "body_text": full_email.body_text,
+                "unsubscribe_url": full_email.unsubscribe_url,
+                "labels": full_email.labels,
+                "category": full_email.category
+            }
 
     if not email:
         return RedirectResponse(url="/inbox", status_code=302)
 
-    return templates.TemplateResponse("email.html", {
+    # Marked read in Gmail by the flush_mark_read batcher
+    _mark_read_queue.add(email_id)
+
+    return stream_template("email.html", {
         "request": request,
         "email": email
     })
 
 
 @app.post("/email/{email_id}/delete")
-async def delete_email(email_id: str):
+async def delete_email(email_id: str, background_tasks: BackgroundTasks):
     """Delete an email."""
-    gmail.delete_emails([email_id])
+    # Gmail is updated after the redirect; the cache is updated right away
+    background_tasks.add_task(gmail.delete_emails, [email_id])
     await db.delete_emails([email_id])
+    invalidate_email_caches()
     return RedirectResponse(url="/inbox", status_code=302)
 
 
 @app.post("/email/{email_id}/archive")
-async def archive_email(email_id: str):
+async def archive_email(email_id: str, background_tasks: BackgroundTasks):
     """Archive an email."""
-    gmail.archive_emails([email_id])
+    background_tasks.add_task(gmail.archive_emails, [email_id])
     await db.delete_emails([email_id])
+    invalidate_email_caches()
     return RedirectResponse(url="/inbox", status_code=302)
 
 
 @app.post("/bulk-action")
 async def bulk_action(
+    background_tasks: BackgroundTasks,
     action: str = Form(...),
     email_ids: list[str] = Form(default=[])
 ):
@@ -210,25 +486,58 @@ async def bulk_action(
     if not email_ids:
         return RedirectResponse(url="/inbox", status_code=302)
 
+    # Gmail is updated after the redirect; the cache is updated right away
     if action == "delete":
-        gmail.delete_emails(email_ids)
-        await db.delete_emails(email_ids)
+        background_tasks.add_task(gmail.delete_emails, email_ids)
     elif action == "archive":
-        gmail.archive_emails(email_ids)
-        await db.delete_emails(email_ids)
+        background_tasks.add_task(gmail.archive_emails, email_ids)
+    else:
+        return RedirectResponse(url="/inbox", status_code=302)
+    await db.delete_emails(email_ids)
+    invalidate_email_caches()
 
     return RedirectResponse(url="/inbox", status_code=302)
 
 
 @app.get("/unsubscribe", response_class=HTMLResponse)
-async def unsubscribe_manager(request: Request):
-    """Show unsubscribe manager with sender list and job history."""
-    senders = await db.get_senders(category="promotions")
+async def unsubscribe_manager(
+    request: Request,
+    page: int = 1,
+    q: Optional[str] = None
+):
+    """Show unsubscribe manager with a page of senders and job history."""
+    global _senders_cache
+    page = max(page, 1)
+    if _senders_cache[0] != _senders_version:
+        _senders_cache = (_senders_version, OrderedDict())
+    pages = _senders_cache[1]
+
+    key = (page, q or None)
+    if key not in pages:
+        senders, sender_stats = await asyncio.gather(
+            db.get_senders(
+                category="promotions",
+                limit=SENDERS_PAGE_SIZE,
+                offset=(page - 1) * SENDERS_PAGE_SIZE,
+                search=q
+            ),
+            db.get_sender_stats(category="promotions", search=q)
+        )
+        pages[key] = (senders, sender_stats)
+        if len(pages) > SENDERS_CACHE_MAX:
+            pages.popitem(last=False)
+    else:
+        pages.move_to_end(key)
+    senders, sender_stats = pages[key]
     recent_jobs = await job_manager.list_jobs(limit=10)
 
-    return templates.TemplateResponse("unsubscribe.html", {
+    return render_template("unsubscribe.html", {
         "request": request,
         "senders": senders,
+        "sender_stats": sender_stats,
+        "page": page,
+        "total_pages": (sender_stats["senders"] + SENDERS_PAGE_SIZE - 1) // SENDERS_PAGE_SIZE,
+        "search": q,
         "unsub_status": unsub_status,
         "recent_jobs": recent_jobs
     })
@@ -240,8 +549,8 @@ async def process_unsubscribe(
     sender_emails: list[str] = Form(default=[])
 ):
     """Start unsubscribe process for selected senders."""
-    # Get unsubscribe URLs for selected senders
-    senders = await db.get_senders(category="promotions")
+    # Get unsubscribe URLs for selected senders only
+    senders = await db.get_senders_by_emails(sender_emails, category="promotions")
     to_process = [
         {
             "sender": s["sender"],
@@ -251,7 +560,7 @@ async def process_unsubscribe(
             "one_click": bool(s.get("unsubscribe_post"))
         }
         for s in senders
-        if s["sender_email"] in sender_emails and (s["unsubscribe_url"] or s.get("unsubscribe_mailto"))
+        if s["unsubscribe_url"] or s.get("unsubscribe_mailto")
     ]
 
     if to_process:
@@ -265,48 +574,81 @@ async def process_unsubscribe(
 @app.get("/api/unsub-status")
 async def get_unsub_status():
     """Get current unsubscribe status from active job."""
+    return await current_unsub_status()
+
+
+@app.get("/api/unsub-events")
+async def unsub_events():
+    """Stream unsubscribe status as server-sent events, pushed on each change."""
+    async def events():
+        update = asyncio.Event()
+        _unsub_listeners.add(update)
+        try:
+            while True:
+                update.clear()
+                seen = _unsub_version
+                yield f"data: {json.dumps(await current_unsub_status())}\n\n"
+                while seen == _unsub_version:
+                    try:
+                        await asyncio.wait_for(update.wait(), UNSUB_EVENTS_KEEPALIVE)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                    update.clear()
+        finally:
+            _unsub_listeners.discard(update)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def current_unsub_status() -> dict:
+    """Status of the active (or most recent) unsubscribe run."""
     # Check for active job in database
     active_job = await job_manager.get_active_job()
     if active_job:
         return await job_manager.get_job_status(active_job.id)
 
     # Fall back to in-memory status (for backwards compat)
-    if unsub_status.get("job_id"):
-        return await job_manager.get_job_status(unsub_status["job_id"])
+    if unsub_status.job_id:
+        return await job_manager.get_job_status(unsub_status.job_id)
 
-    return unsub_status
+    return unsub_status.snapshot()
 
 
 @app.get("/api/failed-urls")
 async def get_failed_urls():
     """Get URLs for failed unsubscribes to open manually."""
     # Get senders that failed
-    failed_senders = [r["sender"] for r in unsub_status.get("results", []) if not r["success"]]
+    failed_senders = [r["sender"] for r in unsub_status.finished_results() if not r["success"]]
     if not failed_senders:
         return {"urls": []}
 
-    # Look up their URLs from the database
-    senders = await db.get_senders(category="promotions")
+    # Look up only their URLs from the database
+    senders = await db.get_senders_by_names(failed_senders, category="promotions")
     urls = [
         {"sender": s["sender"], "url": s["unsubscribe_url"]}
         for s in senders
-        if s["sender"] in failed_senders and s["unsubscribe_url"]
+        if s["unsubscribe_url"]
     ]
     return {"urls": urls}
 
 
-def browser_unsubscribe_worker(item: dict) -> dict:
-    """
-    Worker function for browser-based unsubscribe.
-    Each worker creates its own browser instance.
-    """
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
+def get_chromedriver_path() -> str:
+    """Resolve the ChromeDriver binary once; later calls reuse the cached path."""
+    global _CHROMEDRIVER_PATH
+    with _CHROMEDRIVER_LOCK:
+        if _CHROMEDRIVER_PATH is None:
+            _CHROMEDRIVER_PATH = ChromeDriverManager().install()
+    return _CHROMEDRIVER_PATH
+
+
+def create_browser() -> "webdriver.Chrome":
+    """Launch a headless Chrome instance for browser-based unsubscribe."""
+    if webdriver is None:
+        raise RuntimeError("Selenium is not installed")
 
     options = Options()
     options.add_argument('--headless')
@@ -314,38 +656,100 @@ def browser_unsubscribe_worker(item: dict) -> dict:
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--disable-gpu')
 
-    driver = None
-    try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(15)
+    # Only the DOM is needed to find the button: skip images and stop at DOMContentLoaded
+    options.page_load_strategy = 'eager'
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
 
-        driver.get(item["url"])
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.set_page_load_timeout(8)
+    return driver
 
-        # Use WebDriverWait instead of time.sleep
-        wait = WebDriverWait(driver, 3)
 
-        # Try to click unsubscribe button
-        clicked = False
-        patterns = [
-            "//button[contains(translate(., 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
-            "//input[@type='submit'][contains(translate(@value, 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
-            "//a[contains(translate(., 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
-            "//button[contains(translate(., 'CONFIRM', 'confirm'), 'confirm')]",
-        ]
+class BrowserPool:
+    """
+    Pool of long-lived Chrome drivers shared by browser workers.
+
+    Drivers are started lazily (up to `size`) and reused across items,
+    so Chrome startup is paid once per worker instead of once per item.
+    """
 
-        for pattern in patterns:
+    def __init__(self, size: int):
+        self.size = size
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> "webdriver.Chrome":
+        """Take an idle driver, starting a new one if the pool isn't full."""
+        while True:
+            with self._lock:
+                if self._idle.empty() and len(self._drivers) < self.size:
+                    driver = create_browser()
+                    self._drivers.append(driver)
+                    return driver
+            driver = self._idle.get()
             try:
-                elements = driver.find_elements(By.XPATH, pattern)
-                for elem in elements:
-                    if elem.is_displayed() and elem.is_enabled():
-                        elem.click()
-                        clicked = True
-                        break
+                # Idle drivers outlive a run, so make sure Chrome is still there
+                driver.current_url
+                return driver
+            except Exception:
+                self._discard(driver)
+
+    def release(self, driver: "webdriver.Chrome") -> None:
+        """Return a driver to the pool, clearing cookies between items."""
+        try:
+            driver.delete_all_cookies()
+        except Exception:
+            # Driver is unusable - drop it so a fresh one gets started
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    def _discard(self, driver: "webdriver.Chrome") -> None:
+        """Forget a broken driver and make a best-effort attempt to quit it."""
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def shutdown(self) -> None:
+        """Quit all drivers owned by the pool."""
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+            self._idle = queue.Queue()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def browser_unsubscribe_worker(item: dict, driver: "webdriver.Chrome") -> dict:
+    """
+    Worker function for browser-based unsubscribe.
+    Runs on a driver borrowed from a BrowserPool.
+    """
+    try:
+        driver.get(item["url"])
+
+        # Try to click unsubscribe button (one WebDriver lookup for all patterns)
+        clicked = False
+        for elem in driver.find_elements(By.XPATH, UNSUBSCRIBE_BUTTON_XPATH):
+            try:
+                if elem.is_displayed() and elem.is_enabled():
+                    elem.click()
+                    clicked = True
+                    break
             except:
                 continue
-            if clicked:
-                break
 
         return {
             "sender": item["sender"],
@@ -361,12 +765,58 @@ def browser_unsubscribe_worker(item: dict) -> dict:
             "method": "browser",
             "message": str(e)[:50]
         }
+
+
+def pooled_browser_unsubscribe(pool: BrowserPool, item: dict) -> dict:
+    """Run browser_unsubscribe_worker on a driver borrowed from the pool."""
+    try:
+        driver = pool.acquire()
+    except Exception as e:
+        return {
+            "sender": item["sender"],
+            "success": False,
+            "method": "browser",
+            "message": str(e)[:50]
+        }
+    try:
+        return browser_unsubscribe_worker(item, driver)
     finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+        pool.release(driver)
+
+
+# Chrome drivers are started on demand and kept warm across unsubscribe runs
+browser_pool = BrowserPool(MAX_BROWSER_WORKERS)
+
+
+async def page_unsubscribe(item: dict, http_limit: asyncio.Semaphore) -> dict:
+    """
+    Unsubscribe via a web page: submit its form over plain HTTP, and only
+    fall back to a pooled Chrome when the page needs a real browser.
+    """
+    try:
+        async with http_limit:
+            success, message = await async_form_unsubscribe(item["url"], client=http_client)
+    except Exception as e:
+        success, message = False, str(e)[:50]
+
+    if success:
+        return {
+            "sender": item["sender"],
+            "success": True,
+            "method": "form",
+            "message": message
+        }
+    if webdriver is None:
+        return {
+            "sender": item["sender"],
+            "success": False,
+            "method": "form",
+            "message": f"{message} (no browser available)"
+        }
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _BROWSER_EXECUTOR, pooled_browser_unsubscribe, browser_pool, item
+    )
 
 
 async def run_mass_unsubscribe(items: list[dict]):
@@ -377,13 +827,7 @@ async def run_mass_unsubscribe(items: list[dict]):
     - Browser: Thread pool with 3 concurrent browsers
     - Both phases run simultaneously
     """
-    global unsub_status
-    unsub_status = {
-        "running": True,
-        "progress": 0,
-        "total": len(items),
-        "results": []
-    }
+    unsub_status.start(total=len(items))
 
     # Separate one-click from browser-required
     one_click_items = [i for i in items if i["one_click"]]
@@ -395,13 +839,11 @@ async def run_mass_unsubscribe(items: list[dict]):
     async def bounded_one_click(item: dict) -> dict:
         """Process one-click unsubscribe with concurrency limit and mailto fallback."""
         async with semaphore:
-            success, message = await async_one_click_unsubscribe(item["url"])
+            success, message = await async_one_click_unsubscribe(item["url"], client=http_client)
 
             # If HTTP failed and we have mailto, try that as fallback
             if not success and item.get("mailto"):
-                mailto_success, mailto_message = await send_unsubscribe_email(
-                    item["mailto"], gmail.service
-                )
+                mailto_success, mailto_message = await queue_unsubscribe_email(item["mailto"])
                 if mailto_success:
                     return {
                         "sender": item["sender"],
@@ -419,82 +861,63 @@ async def run_mass_unsubscribe(items: list[dict]):
                 "message": message
             }
 
-    async def process_one_click_batch() -> list[dict]:
-        """Process all one-click items in parallel."""
-        if not one_click_items:
-            return []
-        tasks = [bounded_one_click(item) for item in one_click_items]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        # Handle any exceptions
-        processed = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed.append({
-                    "sender": one_click_items[i]["sender"],
-                    "success": False,
-                    "method": "one-click",
-                    "message": str(result)[:50]
-                })
-            else:
-                processed.append(result)
-        return processed
-
-    async def process_browser_batch() -> list[dict]:
-        """Process all browser items in parallel using thread pool, with mailto fallback."""
-        if not browser_items:
-            return []
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor(max_workers=MAX_BROWSER_WORKERS) as executor:
-            tasks = [
-                loop.run_in_executor(executor, browser_unsubscribe_worker, item)
-                for item in browser_items
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def safe_one_click(item: dict) -> dict:
+        """Run bounded_one_click, turning unexpected errors into a failed result."""
+        try:
+            return await bounded_one_click(item)
+        except Exception as e:
+            return {
+                "sender": item["sender"],
+                "success": False,
+                "method": "one-click",
+                "message": str(e)[:50]
+            }
 
-        # Handle results and try mailto fallback for failures
-        processed = []
-        for i, result in enumerate(results):
-            item = browser_items[i]
+    async def browser_with_fallback(item: dict) -> dict:
+        """Process a page-based item (form, then browser), with mailto fallback."""
+        try:
+            result = await page_unsubscribe(item, semaphore)
+        except Exception as e:
+            result = {
+                "sender": item["sender"],
+                "success": False,
+                "method": "browser",
+                "message": str(e)[:50]
+            }
 
-            if isinstance(result, Exception):
+        # If browser failed and we have mailto, try that
+        if not result["success"] and item.get("mailto"):
+            mailto_success, mailto_message = await queue_unsubscribe_email(item["mailto"])
+            if mailto_success:
                 result = {
                     "sender": item["sender"],
-                    "success": False,
-                    "method": "browser",
-                    "message": str(result)[:50]
+                    "success": True,
+                    "method": "mailto",
+                    "message": mailto_message
                 }
 
-            # If browser failed and we have mailto, try that
-            if not result["success"] and item.get("mailto"):
-                mailto_success, mailto_message = await send_unsubscribe_email(
-                    item["mailto"], gmail.service
-                )
-                if mailto_success:
-                    result = {
-                        "sender": item["sender"],
-                        "success": True,
-                        "method": "mailto",
-                        "message": mailto_message
-                    }
-
-            processed.append(result)
-        return processed
+        return result
 
     try:
-        # Run BOTH phases in parallel
-        one_click_results, browser_results = await asyncio.gather(
-            process_one_click_batch(),
-            process_browser_batch()
-        )
+        # Run BOTH phases in parallel, publishing each result as it finishes
+        tasks = [safe_one_click(item) for item in one_click_items]
+        tasks.extend(browser_with_fallback(item) for item in browser_items)
+
+        async def indexed(index: int, task: Awaitable[dict]) -> tuple[int, dict]:
+            return index, await task
 
-        # Combine results
-        unsub_status["results"] = one_click_results + browser_results
-        unsub_status["progress"] = unsub_status["total"]
+        for next_result in asyncio.as_completed(
+            [indexed(i, task) for i, task in enumerate(tasks)]
+        ):
+            index, result = await next_result
+            unsub_status.results[index] = result
+            unsub_status.progress += 1
+            notify_unsub_update()
 
     except Exception as e:
         print(f"Mass unsubscribe error: {e}")
         # Mark any unprocessed as failed
-        unsub_status["results"].append({
+        unsub_status.results.append({
             "sender": "Unknown",
             "success": False,
             "method": "error",
@@ -502,8 +925,45 @@ async def run_mass_unsubscribe(items: list[dict]):
         })
 
     finally:
-        unsub_status["running"] = False
-        unsub_status["progress"] = unsub_status["total"]
+        unsub_status.running = False
+        unsub_status.progress = unsub_status.total
+        notify_unsub_update()
+
+
+async def run_with_workers(
+    items: list[dict],
+    handler: Callable[[dict], Awaitable[dict]],
+    workers: int,
+    results: list[Optional[dict]]
+) -> None:
+    """
+    Run `handler` over `items` with at most `workers` tasks, writing each
+    result to its item's "index" slot in `results` (and advancing
+    unsub_status) as it completes.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        pending.put_nowait(item)
+
+    async def worker() -> None:
+        while True:
+            try:
+                item = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                result = await handler(item)
+            except Exception as e:
+                result = {
+                    "sender": item.get("sender", "Unknown"),
+                    "success": False,
+                    "method": "error",
+                    "message": str(e)[:50]
+                }
+            results[item["index"]] = result
+            unsub_status.progress += 1
+
+    await asyncio.gather(*(worker() for _ in range(min(workers, len(items)))))
 
 
 async def run_mass_unsubscribe_job(job_id: str):
@@ -513,11 +973,35 @@ async def run_mass_unsubscribe_job(job_id: str):
     Processes job items from the database and updates their status in real-time.
     Survives server restarts - incomplete jobs can be resumed.
     """
-    global unsub_status
+    # Item results are buffered and written in batches by a flusher task
+    pending_updates: deque = deque()
+    updates_done = asyncio.Event()
+    flusher = None
+
+    def record_update(item: dict, status: str, method: str, error: Optional[str]) -> None:
+        pending_updates.append((item["item_id"], status, method, error))
+
+    async def flush_updates() -> None:
+        while pending_updates:
+            batch = [
+                pending_updates.popleft()
+                for _ in range(min(JOB_UPDATE_BATCH, len(pending_updates)))
+            ]
+            await job_manager.update_items_bulk(job_id, batch)
+            notify_unsub_update()
+
+    async def flush_periodically() -> None:
+        while not updates_done.is_set():
+            try:
+                await asyncio.wait_for(updates_done.wait(), JOB_UPDATE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            await flush_updates()
 
     try:
         # Mark job as running
         await job_manager.start_job(job_id)
+        notify_unsub_update()
 
         # Get pending items from database
         pending_items = await job_manager.get_pending_items(job_id)
@@ -526,35 +1010,27 @@ async def run_mass_unsubscribe_job(job_id: str):
             return
 
         # Update in-memory status for backwards compat
-        unsub_status = {
-            "running": True,
-            "progress": 0,
-            "total": len(pending_items),
-            "results": [],
-            "job_id": job_id
-        }
+        unsub_status.start(total=len(pending_items), job_id=job_id)
 
-        # Convert JobItems to processing format
-        items_to_process = []
-        item_id_map = {}  # Map sender to item_id for updates
-
-        for item in pending_items:
-            has_one_click = bool(item.unsubscribe_url and item.unsubscribe_url.startswith('http'))
+        # Convert JobItems to processing format, routing each by method in one pass
+        one_click_items, browser_items, mailto_only_items = [], [], []
+        for index, item in enumerate(pending_items):
+            url = item.unsubscribe_url
             process_item = {
                 "sender": item.sender,
                 "sender_email": item.sender_email,
-                "url": item.unsubscribe_url,
+                "url": url,
                 "mailto": item.unsubscribe_mailto,
-                "one_click": has_one_click,
-                "item_id": item.id
+                "one_click": bool(url and url.startswith('http')),
+                "item_id": item.id,
+                "index": index
             }
-            items_to_process.append(process_item)
-            item_id_map[item.sender] = item.id
-
-        # Separate one-click from browser-required
-        one_click_items = [i for i in items_to_process if i["one_click"]]
-        browser_items = [i for i in items_to_process if not i["one_click"] and i["url"]]
-        mailto_only_items = [i for i in items_to_process if not i["one_click"] and not i["url"] and i["mailto"]]
+            if process_item["one_click"]:
+                one_click_items.append(process_item)
+            elif url:
+                browser_items.append(process_item)
+            elif item.unsubscribe_mailto:
+                mailto_only_items.append(process_item)
 
         # Semaphore to limit concurrent HTTP requests
         semaphore = asyncio.Semaphore(MAX_CONCURRENT_HTTP)
@@ -562,14 +1038,12 @@ async def run_mass_unsubscribe_job(job_id: str):
         async def process_one_click_item(item: dict) -> dict:
             """Process one-click unsubscribe with DB update."""
             async with semaphore:
-                success, message = await async_one_click_unsubscribe(item["url"])
+                success, message = await async_one_click_unsubscribe(item["url"], client=http_client)
                 method = "one-click"
 
                 # Try mailto fallback if HTTP failed
                 if not success and item.get("mailto"):
-                    mailto_success, mailto_message = await send_unsubscribe_email(
-                        item["mailto"], gmail.service
-                    )
+                    mailto_success, mailto_message = await queue_unsubscribe_email(item["mailto"])
                     if mailto_success:
                         success, message, method = True, mailto_message, "mailto"
                     else:
@@ -577,10 +1051,7 @@ async def run_mass_unsubscribe_job(job_id: str):
 
                 # Update item in database
                 status = "success" if success else "failed"
-                await job_manager.update_item(
-                    item["item_id"], status, method,
-                    None if success else message
-                )
+                record_update(item, status, method, None if success else message)
 
                 return {
                     "sender": item["sender"],
@@ -590,33 +1061,22 @@ async def run_mass_unsubscribe_job(job_id: str):
                 }
 
         async def process_browser_item(item: dict) -> dict:
-            """Process browser unsubscribe with DB update."""
-            loop = asyncio.get_event_loop()
-
-            # Run browser in thread pool
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                result = await loop.run_in_executor(
-                    executor, browser_unsubscribe_worker, item
-                )
+            """Process page-based unsubscribe (form, then browser) with DB update."""
+            result = await page_unsubscribe(item, semaphore)
 
             success = result.get("success", False)
             message = result.get("message", "")
-            method = "browser"
+            method = result.get("method", "browser")
 
             # Try mailto fallback if browser failed
             if not success and item.get("mailto"):
-                mailto_success, mailto_message = await send_unsubscribe_email(
-                    item["mailto"], gmail.service
-                )
+                mailto_success, mailto_message = await queue_unsubscribe_email(item["mailto"])
                 if mailto_success:
                     success, message, method = True, mailto_message, "mailto"
 
             # Update item in database
             status = "success" if success else "failed"
-            await job_manager.update_item(
-                item["item_id"], status, method,
-                None if success else message
-            )
+            record_update(item, status, method, None if success else message)
 
             return {
                 "sender": item["sender"],
@@ -627,66 +1087,53 @@ async def run_mass_unsubscribe_job(job_id: str):
 
         async def process_mailto_item(item: dict) -> dict:
             """Process mailto-only unsubscribe with DB update."""
-            async with semaphore:
-                success, message = await send_unsubscribe_email(
-                    item["mailto"], gmail.service
-                )
-
-                # Update item in database
-                status = "success" if success else "failed"
-                await job_manager.update_item(
-                    item["item_id"], status, "mailto",
-                    None if success else message
-                )
+            success, message = await queue_unsubscribe_email(item["mailto"])
 
-                return {
-                    "sender": item["sender"],
-                    "success": success,
-                    "method": "mailto",
-                    "message": message
-                }
-
-        # Process all items in parallel (respecting concurrency limits)
-        all_tasks = []
-        all_tasks.extend([process_one_click_item(i) for i in one_click_items])
+            # Update item in database
+            status = "success" if success else "failed"
+            record_update(item, status, "mailto", None if success else message)
 
-        # Browser items need thread pool - process with limited concurrency
-        browser_semaphore = asyncio.Semaphore(MAX_BROWSER_WORKERS)
-        async def bounded_browser(item):
-            async with browser_semaphore:
-                return await process_browser_item(item)
-        all_tasks.extend([bounded_browser(i) for i in browser_items])
+            return {
+                "sender": item["sender"],
+                "success": success,
+                "method": "mailto",
+                "message": message
+            }
 
-        all_tasks.extend([process_mailto_item(i) for i in mailto_only_items])
+        flusher = asyncio.create_task(flush_periodically())
 
-        # Run all tasks
-        results = await asyncio.gather(*all_tasks, return_exceptions=True)
+        # A fixed set of workers per kind pulls items, so pending items don't
+        # each hold a coroutine; page items share the HTTP limit for their
+        # form step and the browser executor bounds Chrome
+        final_results = unsub_status.results
+        await asyncio.gather(
+            run_with_workers(one_click_items, process_one_click_item, MAX_CONCURRENT_HTTP, final_results),
+            run_with_workers(browser_items, process_browser_item, MAX_CONCURRENT_HTTP, final_results),
+            run_with_workers(mailto_only_items, process_mailto_item, MAX_MAILTO_WORKERS, final_results),
+        )
 
-        # Process results
-        final_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                final_results.append({
-                    "sender": "Unknown",
-                    "success": False,
-                    "method": "error",
-                    "message": str(result)[:50]
-                })
-            else:
-                final_results.append(result)
+        # Write out the last buffered updates
+        updates_done.set()
+        await flusher
 
-        unsub_status["results"] = final_results
-        unsub_status["progress"] = len(final_results)
+        unsub_status.progress = unsub_status.total
 
         # Mark job as completed
         await job_manager.complete_job(job_id, 'completed')
 
     except Exception as e:
         print(f"Job {job_id} error: {e}")
+        if flusher and not flusher.done():
+            updates_done.set()
+            try:
+                await flusher
+            except Exception as flush_error:
+                print(f"Job {job_id} update error: {flush_error}")
         await job_manager.complete_job(job_id, 'failed')
 
     finally:
-        unsub_status["running"] = False
+        unsub_status.running = False
+        notify_unsub_update()
 
 
 # Keep old sync_status reference for compatibility
@@ -705,58 +1152,86 @@ async def sync_emails(background_tasks: BackgroundTasks, max_emails: int = 500):
 
 async def do_sync(max_emails: int):
     """Background task to sync emails."""
-    global sync_status
-    sync_status = {
-        "running": True,
-        "progress": 0,
-        "total": max_emails,
-        "message": "Fetching emails from Gmail..."
-    }
+    sync_status.running = True
+    sync_status.progress = 0
+    sync_status.total = max_emails
+    sync_status.message = "Fetching emails from Gmail..."
+
+    def fetch_page(max_results: int, page_token: Optional[str]) -> asyncio.Task:
+        """Start fetching a page from Gmail on a worker thread."""
+        return asyncio.create_task(asyncio.to_thread(
+            gmail.get_emails,
+            query='',
+            max_results=min(100, max_results),
+            page_token=page_token
+        ))
+
+    fetched = 0
+    saved = 0
+    buffer: list = []
+    next_page = None
+
+    async def flush() -> None:
+        """Write buffered emails in one transaction."""
+        nonlocal saved
+        await db.save_emails(buffer)
+        saved += len(buffer)
+        buffer.clear()
+        invalidate_email_caches()
 
     try:
-        page_token = None
-        fetched = 0
+        next_page = fetch_page(max_emails, None)
 
-        while fetched < max_emails:
-            emails, page_token = gmail.get_emails(
-                query='',
-                max_results=min(100, max_emails - fetched),
-                page_token=page_token
-            )
+        while next_page:
+            emails, page_token = await next_page
+            next_page = None
 
             if not emails:
                 break
 
-            await db.save_emails(emails)
-            fetched += len(emails)
-
-            sync_status["progress"] = fetched
-            sync_status["message"] = f"Synced {fetched} emails..."
+            # Fetch the following page while this one is written to SQLite
+            remaining = max_emails - fetched - len(emails)
+            if page_token and remaining > 0:
+                next_page = fetch_page(remaining, page_token)
 
-            if not page_token:
-                break
+            buffer.extend(emails)
+            fetched += len(emails)
+            if len(buffer) >= SYNC_WRITE_BATCH or not next_page:
+                await flush()
 
-        # Rebuild FTS index
-        sync_status["message"] = "Building search index..."
-        await db.rebuild_fts()
+            sync_status.progress = fetched
+            sync_status.message = f"Synced {fetched} emails..."
 
     except Exception as e:
-        sync_status["message"] = f"Sync error: {e}"
+        sync_status.message = f"Sync error: {e}"
         print(f"Sync error: {e}")
 
     finally:
-        sync_status = {
-            "running": False,
-            "progress": 0,
-            "total": 0,
-            "message": f"Synced {fetched} emails"
-        }
+        if next_page:
+            next_page.cancel()
+        # Keep whatever was fetched before an error
+        if buffer:
+            try:
+                await flush()
+            except Exception as e:
+                print(f"Sync save error: {e}")
+        sync_status.running = False
+        sync_status.progress = 0
+        sync_status.total = 0
+        sync_status.message = f"Synced {saved} emails"
 
 
 @app.get("/api/sync-status")
 async def get_sync_status():
     """Get current sync status."""
-    return sync_status
+    return asdict(sync_status)
+
+
+@app.post("/api/rebuild-search-index")
+async def rebuild_search_index():
+    """Rebuild the full-text search index (one-off repair)."""
+    await db.rebuild_fts()
+    return {"status": "ok", "message": "Search index rebuilt"}
 
 
 # Job management endpoints
@@ -5,11 +5,14 @@ Caches email metadata for fast browsing without hitting Gmail API.
 """
 
 import os
+import json
 import sqlite3
+import asyncio
 import aiosqlite
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
+from contextlib import asynccontextmanager
 from dataclasses import asdict
 
 from gmail_client import Email
@@ -17,10 +20,87 @@ from gmail_client import Email
 PROJECT_DIR = Path(__file__).parent
 DB_FILE = Path(os.getenv("DB_PATH", str(PROJECT_DIR / 'emails.db')))
 
+# SQLite's default limit on bound parameters per statement
+SQLITE_MAX_VARIABLES = 999
+
+# Rows per save_emails transaction, bounding WAL growth on large saves
+SAVE_BATCH_SIZE = 1000
+
+# Rows pulled per fetch when streaming large result sets
+FETCH_CHUNK_SIZE = 1000
+
+# Insert or update an email. A message's headers never change, so re-syncs
+# only touch the mutable columns, and rows whose state is unchanged are skipped
+# entirely; cached bodies survive metadata-only re-syncs
+SAVE_EMAIL_SQL = '''
+    INSERT INTO emails
+    (id, thread_id, subject, sender, sender_email, date, snippet,
+     category, unsubscribe_url, unsubscribe_mailto, unsubscribe_post, is_read,
+     body_html, body_text, synced_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        category = excluded.category,
+        unsubscribe_url = excluded.unsubscribe_url,
+        unsubscribe_mailto = excluded.unsubscribe_mailto,
+        unsubscribe_post = excluded.unsubscribe_post,
+        is_read = excluded.is_read,
+        body_html = COALESCE(excluded.body_html, emails.body_html),
+        body_text = COALESCE(excluded.body_text, emails.body_text),
+        synced_at = excluded.synced_at
+    WHERE emails.category IS NOT excluded.category
+        OR emails.is_read IS NOT excluded.is_read
+        OR emails.unsubscribe_url IS NOT excluded.unsubscribe_url
+        OR emails.unsubscribe_mailto IS NOT excluded.unsubscribe_mailto
+        OR emails.unsubscribe_post IS NOT excluded.unsubscribe_post
+        OR (excluded.body_html IS NOT NULL AND emails.body_html IS NOT excluded.body_html)
+        OR (excluded.body_text IS NOT NULL AND emails.body_text IS NOT excluded.body_text)
+'''
+
+# Labels live in email_labels; a re-sync drops labels the message lost and
+# adds new ones, leaving unchanged label rows untouched
+PRUNE_LABELS_SQL = '''
+    DELETE FROM email_labels
+    WHERE email_id = ? AND label NOT IN (SELECT value FROM json_each(?))
+'''
+INSERT_LABEL_SQL = 'INSERT OR IGNORE INTO email_labels (email_id, label) VALUES (?, ?)'
+
+# Prepared statements kept per connection. The query builders emit many
+# filter/cursor variants, so the default of 128 could evict the hot upsert
+SQLITE_STATEMENT_CACHE = 512
+
+# Only journal_mode (WAL) persists in the file; these are per connection.
+# Writers on other connections (e.g. JobManager) wait up to busy_timeout for the lock
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+SQLITE_BUSY_TIMEOUT_MS = 30000
+CONNECTION_PRAGMAS = f'''
+    PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS};
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size={SQLITE_MMAP_SIZE};
+'''
+
+# Per-sender aggregate shared by the sender queries
+SENDER_COLUMNS = '''
+    sender,
+    sender_email,
+    COUNT(*) as email_count,
+    MAX(unsubscribe_url) as unsubscribe_url,
+    MAX(unsubscribe_mailto) as unsubscribe_mailto,
+    MAX(unsubscribe_post) as unsubscribe_post,
+    MAX(date) as last_email
+'''
+
 
 def init_db():
     """Initialize database schema (sync version for startup)."""
     conn = sqlite3.connect(str(DB_FILE))
+    # WAL persists in the database file, so every later connection uses it
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-64000')
+    conn.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
     conn.execute('''
         CREATE TABLE IF NOT EXISTS emails (
             id TEXT PRIMARY KEY,
@@ -30,7 +110,6 @@ def init_db():
             sender_email TEXT,
             date TEXT,
             snippet TEXT,
-            labels TEXT,
             category TEXT,
             unsubscribe_url TEXT,
             unsubscribe_post INTEGER DEFAULT 0,
@@ -47,23 +126,130 @@ def init_db():
         conn.execute('ALTER TABLE emails ADD COLUMN unsubscribe_mailto TEXT')
     except sqlite3.OperationalError:
         pass  # Column already exists
+    for column in ('body_html', 'body_text'):
+        try:
+            conn.execute(f'ALTER TABLE emails ADD COLUMN {column} TEXT')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+    # Labels as rows rather than a CSV column, indexed for label lookups
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS email_labels (
+            email_id TEXT NOT NULL,
+            label TEXT NOT NULL,
+            PRIMARY KEY (email_id, label)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_label_email ON email_labels(label, email_id);
+        CREATE TRIGGER IF NOT EXISTS emails_labels_ad AFTER DELETE ON emails BEGIN
+            DELETE FROM email_labels WHERE email_id = old.id;
+        END;
+    ''')
+    email_columns = [row[1] for row in conn.execute("PRAGMA table_info(emails)")]
+    if 'labels' in email_columns:
+        # Move the old comma-separated labels over, then drop the column
+        conn.executemany(INSERT_LABEL_SQL, (
+            (email_id, label)
+            for email_id, labels in conn.execute(
+                "SELECT id, labels FROM emails WHERE labels IS NOT NULL AND labels != ''"
+            ).fetchall()
+            for label in labels.split(',')
+        ))
+        conn.execute('ALTER TABLE emails DROP COLUMN labels')
+
     conn.execute('''
         CREATE INDEX IF NOT EXISTS idx_sender_email ON emails(sender_email)
     ''')
     conn.execute('''
-        CREATE INDEX IF NOT EXISTS idx_category ON emails(category)
+        CREATE INDEX IF NOT EXISTS idx_sender ON emails(sender)
+    ''')
+    # Sender list for a category: filter and GROUP BY sender_email from one index
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_category_sender ON emails(category, sender_email)
     ''')
+    # Prefixes of the composite indexes below
+    conn.execute('DROP INDEX IF EXISTS idx_category')
+    conn.execute('DROP INDEX IF EXISTS idx_date')
+    # Keyset pagination seeks on (date, id), optionally within a category
     conn.execute('''
-        CREATE INDEX IF NOT EXISTS idx_date ON emails(date DESC)
+        CREATE INDEX IF NOT EXISTS idx_date_id ON emails(date, id)
     ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_category_date_id ON emails(category, date, id)
+    ''')
+    # Older databases indexed the text id too; search joins on rowid now,
+    # so drop that index (and its triggers) to be recreated without it
+    fts_columns = [row[1] for row in conn.execute("PRAGMA table_info(emails_fts)")]
+    if 'id' in fts_columns:
+        conn.executescript('''
+            DROP TRIGGER IF EXISTS emails_fts_ai;
+            DROP TRIGGER IF EXISTS emails_fts_ad;
+            DROP TRIGGER IF EXISTS emails_fts_au;
+            DROP TABLE emails_fts;
+        ''')
     conn.execute('''
         CREATE VIRTUAL TABLE IF NOT EXISTS emails_fts USING fts5(
-            id, subject, sender, snippet,
+            subject, sender, snippet,
             content=emails,
             content_rowid=rowid
         )
     ''')
 
+    # Keep the FTS index in step with emails incrementally via triggers
+    has_fts_triggers = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'emails_fts_ai'"
+    ).fetchone() is not None
+    conn.executescript('''
+        CREATE TRIGGER IF NOT EXISTS emails_fts_ai AFTER INSERT ON emails BEGIN
+            INSERT INTO emails_fts(rowid, subject, sender, snippet)
+            VALUES (new.rowid, new.subject, new.sender, new.snippet);
+        END;
+        CREATE TRIGGER IF NOT EXISTS emails_fts_ad AFTER DELETE ON emails BEGIN
+            INSERT INTO emails_fts(emails_fts, rowid, subject, sender, snippet)
+            VALUES ('delete', old.rowid, old.subject, old.sender, old.snippet);
+        END;
+        CREATE TRIGGER IF NOT EXISTS emails_fts_au AFTER UPDATE OF subject, sender, snippet ON emails BEGIN
+            INSERT INTO emails_fts(emails_fts, rowid, subject, sender, snippet)
+            VALUES ('delete', old.rowid, old.subject, old.sender, old.snippet);
+            INSERT INTO emails_fts(rowid, subject, sender, snippet)
+            VALUES (new.rowid, new.subject, new.sender, new.snippet);
+        END;
+    ''')
+    if not has_fts_triggers:
+        # Index rows written before the triggers existed
+        conn.execute("INSERT INTO emails_fts(emails_fts) VALUES('rebuild')")
+
+    # Per-category email counts, maintained by triggers so counting is a lookup
+    has_counts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'category_counts'"
+    ).fetchone() is not None
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS category_counts (
+            category TEXT PRIMARY KEY,
+            cnt INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TRIGGER IF NOT EXISTS emails_count_ai AFTER INSERT ON emails BEGIN
+            INSERT INTO category_counts(category, cnt) VALUES (COALESCE(new.category, ''), 1)
+            ON CONFLICT(category) DO UPDATE SET cnt = cnt + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS emails_count_ad AFTER DELETE ON emails BEGIN
+            UPDATE category_counts SET cnt = cnt - 1
+            WHERE category = COALESCE(old.category, '');
+        END;
+        CREATE TRIGGER IF NOT EXISTS emails_count_au AFTER UPDATE OF category ON emails
+        WHEN old.category IS NOT new.category BEGIN
+            UPDATE category_counts SET cnt = cnt - 1
+            WHERE category = COALESCE(old.category, '');
+            INSERT INTO category_counts(category, cnt) VALUES (COALESCE(new.category, ''), 1)
+            ON CONFLICT(category) DO UPDATE SET cnt = cnt + 1;
+        END;
+    ''')
+    if not has_counts:
+        # Count rows written before the table existed
+        conn.execute('''
+            INSERT INTO category_counts(category, cnt)
+            SELECT COALESCE(category, ''), COUNT(*) FROM emails GROUP BY COALESCE(category, '')
+        ''')
+
     # Jobs table for tracking unsubscribe runs
     conn.execute('''
         CREATE TABLE IF NOT EXISTS jobs (
@@ -97,8 +283,27 @@ def init_db():
         )
     ''')
 
-    conn.execute('CREATE INDEX IF NOT EXISTS idx_job_items_job_id ON job_items(job_id)')
+    # Pending/failed scans seek on (job_id, status) and read in id order;
+    # the old job_id-only index is a prefix of it
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_job_items_job_status_id ON job_items(job_id, status, id)
+    ''')
+    conn.execute('DROP INDEX IF EXISTS idx_job_items_job_id')
+
+    # Job counters follow item outcomes, so recording a result is one UPDATE
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS job_items_status_au AFTER UPDATE OF status ON job_items
+        WHEN new.status IN ('success', 'failed') AND old.status IS NOT new.status BEGIN
+            UPDATE jobs
+            SET completed_items = completed_items + 1,
+                successful_items = successful_items + (new.status = 'success'),
+                failed_items = failed_items + (new.status = 'failed')
+            WHERE id = new.job_id;
+        END
+    ''')
     conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)')
+    # list_jobs: newest first
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at DESC)')
 
     conn.commit()
     conn.close()
@@ -109,16 +314,59 @@ class EmailDatabase:
 
     def __init__(self):
         self.db_path = str(DB_FILE)
+        # Long-lived connections: one writer, one read-only for queries
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._reader: Optional[aiosqlite.Connection] = None
+        self._open_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    async def open(self):
+        """Open the shared connections (idempotent; also done lazily on first use)."""
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+            writer = await aiosqlite.connect(
+                self.db_path, cached_statements=SQLITE_STATEMENT_CACHE
+            )
+            reader = await aiosqlite.connect(
+                f'file:{self.db_path}?mode=ro', uri=True,
+                cached_statements=SQLITE_STATEMENT_CACHE
+            )
+            for db in (writer, reader):
+                await db.executescript(CONNECTION_PRAGMAS)
+                db.row_factory = aiosqlite.Row
+            self._writer, self._reader = writer, reader
+
+    async def close(self):
+        """Close the shared connections."""
+        async with self._open_lock:
+            for db in (self._writer, self._reader):
+                if db is not None:
+                    await db.close()
+            self._writer = self._reader = None
+
+    @asynccontextmanager
+    async def _connect(self, write: bool = False):
+        """
+        Yield a shared connection: the read-only one, or with write=True the
+        writer, held under the write lock and rolled back if the block fails.
+        """
+        if self._writer is None:
+            await self.open()
+        if not write:
+            yield self._reader
+            return
+        async with self._write_lock:
+            try:
+                yield self._writer
+            except BaseException:
+                await self._writer.rollback()
+                raise
 
     async def save_email(self, email: Email):
         """Save or update an email in the cache."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('''
-                INSERT OR REPLACE INTO emails
-                (id, thread_id, subject, sender, sender_email, date, snippet,
-                 labels, category, unsubscribe_url, unsubscribe_mailto, unsubscribe_post, is_read, synced_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        async with self._connect(write=True) as db:
+            await db.execute(SAVE_EMAIL_SQL, (
                 email.id,
                 email.thread_id,
                 email.subject,
@@ -126,137 +374,320 @@ class EmailDatabase:
                 email.sender_email,
                 email.date.isoformat(),
                 email.snippet,
-                ','.join(email.labels),
                 email.category,
                 email.unsubscribe_url,
                 email.unsubscribe_mailto,
                 1 if email.unsubscribe_post else 0,
                 1 if email.is_read else 0,
+                email.body_html,
+                email.body_text,
                 datetime.now().isoformat()
             ))
+            await self._write_labels(db, [email])
             await db.commit()
 
+    @staticmethod
+    async def _write_labels(db: aiosqlite.Connection, emails: list[Email]):
+        """Sync email_labels with each email's current labels."""
+        await db.executemany(PRUNE_LABELS_SQL, [
+            (e.id, json.dumps(e.labels)) for e in emails
+        ])
+        await db.executemany(INSERT_LABEL_SQL, [
+            (e.id, label) for e in emails for label in e.labels
+        ])
+
     async def save_emails(self, emails: list[Email]):
-        """Bulk save emails."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.executemany('''
-                INSERT OR REPLACE INTO emails
-                (id, thread_id, subject, sender, sender_email, date, snippet,
-                 labels, category, unsubscribe_url, unsubscribe_mailto, unsubscribe_post, is_read, synced_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', [
-                (
-                    e.id, e.thread_id, e.subject, e.sender, e.sender_email,
-                    e.date.isoformat(), e.snippet, ','.join(e.labels),
-                    e.category, e.unsubscribe_url, e.unsubscribe_mailto,
-                    1 if e.unsubscribe_post else 0,
-                    1 if e.is_read else 0, datetime.now().isoformat()
-                )
-                for e in emails
-            ])
-            await db.commit()
+        """Bulk save emails, one write transaction per SAVE_BATCH_SIZE rows."""
+        synced_at = datetime.now().isoformat()
+        async with self._connect(write=True) as db:
+            for start in range(0, len(emails), SAVE_BATCH_SIZE):
+                chunk = emails[start:start + SAVE_BATCH_SIZE]
+                await db.execute('BEGIN IMMEDIATE')
+                await db.executemany(SAVE_EMAIL_SQL, [
+                    (
+                        e.id, e.thread_id, e.subject, e.sender, e.sender_email,
+                        e.date.isoformat(), e.snippet,
+                        e.category, e.unsubscribe_url, e.unsubscribe_mailto,
+                        1 if e.unsubscribe_post else 0,
+                        1 if e.is_read else 0, e.body_html, e.body_text,
+                        synced_at
+                    )
+                    for e in chunk
+                ])
+                await self._write_labels(db, chunk)
+                await db.commit()
 
     async def get_emails(
         self,
         category: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        after: Optional[tuple[str, str]] = None,
+        before: Optional[tuple[str, str]] = None
     ) -> list[dict]:
-        """Get emails from cache with optional filtering."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        """
+        Get emails from cache with optional filtering, newest first.
+
+        `after`/`before` are (date, id) keyset cursors for the next/previous
+        page; when neither is given, `offset` is used.
+        """
+        emails, _ = await self._query_emails(
+            category, limit, offset, search, after, before, with_total=False
+        )
+        return emails
 
+    async def search_emails_with_total(
+        self,
+        search: str,
+        category: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[tuple[str, str]] = None,
+        before: Optional[tuple[str, str]] = None
+    ) -> tuple[list[dict], int]:
+        """
+        Get a page of search results, as get_emails, plus the total number
+        of matches - counted in the same query, since category_counts
+        can't answer searches.
+        """
+        return await self._query_emails(
+            category, limit, offset, search, after, before, with_total=True
+        )
+
+    async def _query_emails(
+        self,
+        category: Optional[str],
+        limit: int,
+        offset: int,
+        search: Optional[str],
+        after: Optional[tuple[str, str]],
+        before: Optional[tuple[str, str]],
+        with_total: bool
+    ) -> tuple[list[dict], Optional[int]]:
+        """Page query behind get_emails and search_emails_with_total (total None without with_total)."""
+        async with self._connect() as db:
+
+            query = ''
+            params = []
             if search:
-                # Full-text search
+                # Full-text search: resolve matches from the FTS index first,
+                # then filter/sort that set, joining on the shared rowid
                 query = '''
-                    SELECT e.* FROM emails e
-                    JOIN emails_fts fts ON e.id = fts.id
-                    WHERE emails_fts MATCH ?
+                    WITH matches AS MATERIALIZED (
+                        SELECT rowid FROM emails_fts WHERE emails_fts MATCH ?
+                    )
                 '''
-                params = [search]
+                source = 'matches m JOIN emails e ON e.rowid = m.rowid WHERE 1=1'
+                params.append(search)
             else:
-                query = 'SELECT * FROM emails WHERE 1=1'
-                params = []
+                source = 'emails e WHERE 1=1'
 
             if category and category != 'all':
-                query += ' AND category = ?'
+                source += ' AND e.category = ?'
                 params.append(category)
 
-            query += ' ORDER BY date DESC LIMIT ? OFFSET ?'
-            params.extend([limit, offset])
+            # Filters only, for counting when the page itself comes back empty
+            count_query = query + f'SELECT COUNT(*) FROM {source}'
+            count_params = list(params)
+
+            if with_total:
+                # Count the whole filtered set before the page/cursor applies
+                query += f'''
+                    SELECT * FROM (
+                        SELECT e.*, COUNT(*) OVER () AS total_count FROM {source}
+                    ) e WHERE 1=1
+                '''
+            else:
+                query += f'SELECT e.* FROM {source}'
+
+            order = 'DESC'
+            if after:
+                query += ' AND (e.date, e.id) < (?, ?)'
+                params.extend(after)
+            elif before:
+                # Walk backwards from the cursor, then flip back to newest first
+                query += ' AND (e.date, e.id) > (?, ?)'
+                params.extend(before)
+                order = 'ASC'
+
+            query += f' ORDER BY e.date {order}, e.id {order} LIMIT ?'
+            params.append(limit)
+            if not (after or before):
+                query += ' OFFSET ?'
+                params.append(offset)
 
             cursor = await db.execute(query, params)
             rows = await cursor.fetchall()
 
-            return [dict(row) for row in rows]
+            emails = [dict(row) for row in rows]
+            if before:
+                emails.reverse()
+            if not with_total:
+                return emails, None
+
+            if not emails:
+                # No row carries total_count past the end, so count separately
+                cursor = await db.execute(count_query, count_params)
+                return emails, (await cursor.fetchone())[0]
+
+            for email in emails:
+                total = email.pop('total_count')
+            return emails, total
 
     async def get_email(self, email_id: str) -> Optional[dict]:
         """Get single email by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                'SELECT * FROM emails WHERE id = ?',
-                (email_id,)
-            )
+        async with self._connect() as db:
+            cursor = await db.execute('''
+                SELECT e.*,
+                    (SELECT group_concat(label) FROM email_labels WHERE email_id = e.id) AS labels
+                FROM emails e WHERE e.id = ?
+            ''', (email_id,))
             row = await cursor.fetchone()
             return dict(row) if row else None
 
-    async def get_senders(self, category: Optional[str] = None) -> list[dict]:
-        """Get unique senders with email counts."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+    async def get_senders(
+        self,
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        search: Optional[str] = None
+    ) -> list[dict]:
+        """Get unique senders with email counts, optionally one page at a time."""
+        async with self._connect() as db:
 
-            query = '''
+            where, params = self._sender_filter(category, search)
+            query = f'SELECT {SENDER_COLUMNS} FROM emails{where}'
+            query += ' GROUP BY sender_email ORDER BY email_count DESC, sender_email'
+            if limit is not None:
+                query += ' LIMIT ? OFFSET ?'
+                params.extend([limit, offset])
+
+            cursor = await db.execute(query, params)
+            cursor.arraysize = FETCH_CHUNK_SIZE
+
+            # Build dicts chunk by chunk instead of holding every Row as well
+            return [dict(row) async for row in cursor]
+
+    async def get_sender_stats(
+        self,
+        category: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> dict:
+        """Count senders by unsubscribe method (same filters as get_senders)."""
+        async with self._connect() as db:
+
+            where, params = self._sender_filter(category, search)
+            cursor = await db.execute(f'''
                 SELECT
-                    sender,
-                    sender_email,
-                    COUNT(*) as email_count,
-                    MAX(unsubscribe_url) as unsubscribe_url,
-                    MAX(unsubscribe_mailto) as unsubscribe_mailto,
-                    MAX(unsubscribe_post) as unsubscribe_post,
-                    MAX(date) as last_email
-                FROM emails
-            '''
-            params = []
+                    COUNT(*) as senders,
+                    COALESCE(SUM(unsubscribe_post), 0) as one_click,
+                    COALESCE(SUM(has_url AND NOT unsubscribe_post), 0) as browser,
+                    COALESCE(SUM(NOT has_url), 0) as no_link
+                FROM (
+                    SELECT
+                        COALESCE(MAX(unsubscribe_url), '') != '' as has_url,
+                        COALESCE(MAX(unsubscribe_post), 0) as unsubscribe_post
+                    FROM emails{where}
+                    GROUP BY sender_email
+                )
+            ''', params)
+            row = await cursor.fetchone()
+            return dict(row)
+
+    @staticmethod
+    def _sender_filter(
+        category: Optional[str],
+        search: Optional[str]
+    ) -> tuple[str, list]:
+        """WHERE clause and params for the sender list filters."""
+        clauses = []
+        params = []
+        if category and category != 'all':
+            clauses.append('category = ?')
+            params.append(category)
+        if search:
+            clauses.append('(sender LIKE ? OR sender_email LIKE ?)')
+            params.extend([f'%{search}%'] * 2)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    async def get_senders_by_names(
+        self,
+        names: list[str],
+        category: Optional[str] = None
+    ) -> list[dict]:
+        """Get sender aggregates (as in get_senders) for the given display names."""
+        return await self._get_senders_in('sender', names, category)
 
-            if category and category != 'all':
-                query += ' WHERE category = ?'
-                params.append(category)
+    async def get_senders_by_emails(
+        self,
+        sender_emails: list[str],
+        category: Optional[str] = None
+    ) -> list[dict]:
+        """Get sender aggregates (as in get_senders) for the given addresses."""
+        return await self._get_senders_in('sender_email', sender_emails, category)
+
+    async def _get_senders_in(
+        self,
+        column: str,
+        values: list[str],
+        category: Optional[str] = None
+    ) -> list[dict]:
+        """Get sender aggregates where `column` is one of `values`."""
+        if not values:
+            return []
 
-            query += ' GROUP BY sender_email ORDER BY email_count DESC'
+        # Leave room for the category parameter
+        chunk_size = SQLITE_MAX_VARIABLES - 1
+        senders = []
 
-            cursor = await db.execute(query, params)
-            rows = await cursor.fetchall()
+        async with self._connect() as db:
+
+            for i in range(0, len(values), chunk_size):
+                chunk = values[i:i + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                query = f'SELECT {SENDER_COLUMNS} FROM emails WHERE {column} IN ({placeholders})'
+                params = list(chunk)
+
+                if category and category != 'all':
+                    query += ' AND category = ?'
+                    params.append(category)
+
+                query += ' GROUP BY sender_email ORDER BY email_count DESC'
+
+                cursor = await db.execute(query, params)
+                cursor.arraysize = FETCH_CHUNK_SIZE
+                senders.extend([dict(row) async for row in cursor])
 
-            return [dict(row) for row in rows]
+        return senders
 
     async def delete_emails(self, email_ids: list[str]):
-        """Remove emails from cache."""
-        async with aiosqlite.connect(self.db_path) as db:
-            placeholders = ','.join('?' * len(email_ids))
-            await db.execute(
-                f'DELETE FROM emails WHERE id IN ({placeholders})',
-                email_ids
+        """Remove emails from cache in one transaction."""
+        async with self._connect(write=True) as db:
+            # One prepared statement reused per id; no variable-count limit
+            await db.execute('BEGIN IMMEDIATE')
+            await db.executemany(
+                'DELETE FROM emails WHERE id = ?',
+                ((email_id,) for email_id in email_ids)
             )
             await db.commit()
 
     async def get_count(self, category: Optional[str] = None) -> int:
-        """Get total email count."""
-        async with aiosqlite.connect(self.db_path) as db:
+        """Get total email count (from the trigger-maintained category_counts)."""
+        async with self._connect() as db:
             if category and category != 'all':
                 cursor = await db.execute(
-                    'SELECT COUNT(*) FROM emails WHERE category = ?',
+                    'SELECT cnt FROM category_counts WHERE category = ?',
                     (category,)
                 )
             else:
-                cursor = await db.execute('SELECT COUNT(*) FROM emails')
+                cursor = await db.execute('SELECT COALESCE(SUM(cnt), 0) FROM category_counts')
 
             row = await cursor.fetchone()
             return row[0] if row else 0
 
     async def rebuild_fts(self):
-        """Rebuild full-text search index."""
-        async with aiosqlite.connect(self.db_path) as db:
+        """Rebuild full-text search index from scratch (repair only; triggers keep it current)."""
+        async with self._connect(write=True) as db:
             await db.execute("INSERT INTO emails_fts(emails_fts) VALUES('rebuild')")
             await db.commit()
@@ -8,17 +8,25 @@ Handles authentication, email fetching, and modifications.
 import os
 import re
 import base64
+import time
+import threading
 import requests
 import httpx
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from dataclasses import dataclass, field
+from html import unescape
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
 from bs4 import BeautifulSoup
 
 # Gmail API scopes
@@ -32,6 +40,42 @@ PROJECT_DIR = Path(__file__).parent
 CREDENTIALS_FILE = PROJECT_DIR / 'credentials.json'
 TOKEN_FILE = PROJECT_DIR / 'token.json'
 
+# Gmail's batchModify accepts at most 1000 message IDs per call
+BATCH_MODIFY_LIMIT = 1000
+
+# Sub-requests per HTTP batch. Gmail accepts 100, but larger batches tend
+# to get some sub-requests rate-limited (429); Google advises 50 or fewer
+BATCH_REQUEST_LIMIT = 50
+# Rate-limited sub-requests are re-batched up to this many times, backing off
+BATCH_MAX_RETRIES = 4
+BATCH_RETRY_DELAY = 1.0
+
+# Headers requested when syncing message metadata
+METADATA_HEADERS = ['From', 'Subject', 'Date', 'List-Unsubscribe', 'List-Unsubscribe-Post']
+
+# Header parsing patterns, compiled once for the per-message hot path
+SENDER_PATTERN = re.compile(r'^"?([^"<]+)"?\s*<([^>]+)>')
+EMAIL_ADDRESS_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+')
+UNSUB_URL_PATTERN = re.compile(r'<(https?://[^>]+)>')
+UNSUB_MAILTO_PATTERN = re.compile(r'<mailto:([^>]+)>')
+
+# Body link scan: anchors with a double-quoted, single-quoted or unquoted
+# href, and their inner HTML
+ANCHOR_PATTERN = re.compile(
+    r'<a\s[^>]*?\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))[^>]*>(.*?)</a\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+HREF_PATTERN = re.compile(r'href', re.IGNORECASE)
+
+# Unsubscribe pages above this size are left to the browser (likely JS apps)
+MAX_FORM_PAGE_BYTES = 100_000
+UNSUBSCRIBE_CONTROL_PATTERN = re.compile(r'unsub|confirm|opt.?out', re.IGNORECASE)
+UNSUBSCRIBED_TEXT_PATTERN = re.compile(
+    r"(?:have been|successfully|you're|you are)\s+(?:been\s+)?(?:unsubscribed|removed)",
+    re.IGNORECASE
+)
+
 
 @dataclass
 class Email:
@@ -64,6 +108,42 @@ class Email:
         return 'CATEGORY_PROMOTIONS' in self.labels
 
 
+def _is_retryable(exception: Exception) -> bool:
+    """True for Gmail errors worth retrying: rate limits and transient 5xx."""
+    if not isinstance(exception, HttpError):
+        return False
+    status = exception.resp.status
+    if status == 403:
+        return b'ateLimitExceeded' in (exception.content or b'')
+    return status in (429, 500, 502, 503, 504)
+
+
+@lru_cache(maxsize=4096)
+def _try_parse_date(date_str: str) -> Optional[datetime]:
+    """Parse a Date header, memoized since senders batch identical timestamps.
+
+    Returns None on failure so the now() fallback is never cached.
+    """
+    try:
+        return parsedate_to_datetime(date_str)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=2048)
+def _parse_unsubscribe_header(header: str) -> tuple[Optional[str], Optional[str]]:
+    """Get (url, mailto) from a List-Unsubscribe header.
+
+    Memoized because a mailing list sends the same header on every message.
+    """
+    if not header or '<' not in header:
+        return None, None
+    url = UNSUB_URL_PATTERN.search(header)
+    # Match mailto: links like <mailto:unsubscribe@example.com> or <mailto:unsub@example.com?subject=unsubscribe>
+    mailto = UNSUB_MAILTO_PATTERN.search(header)
+    return (url.group(1) if url else None), (mailto.group(1) if mailto else None)
+
+
 def one_click_unsubscribe(url: str, timeout: int = 10) -> tuple[bool, str]:
     """
     Perform one-click unsubscribe via HTTP POST (RFC 8058).
@@ -105,7 +185,8 @@ async def async_one_click_unsubscribe(
     url: str,
     timeout: int = 15,
     max_retries: int = 2,
-    backoff_factor: float = 1.5
+    backoff_factor: float = 1.5,
+    client: Optional[httpx.AsyncClient] = None
 ) -> tuple[bool, str]:
     """
     Async version of one-click unsubscribe via HTTP POST (RFC 8058).
@@ -113,28 +194,36 @@ async def async_one_click_unsubscribe(
 
     Args:
         url: The unsubscribe URL from List-Unsubscribe header
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds (ignored when client is given)
         max_retries: Maximum number of retry attempts
         backoff_factor: Multiplier for exponential backoff
+        client: Shared client to reuse pooled connections; a one-off
+            client is created per attempt if omitted
 
     Returns:
         Tuple of (success: bool, message: str)
     """
     import asyncio
 
+    async def post(http: httpx.AsyncClient) -> httpx.Response:
+        return await http.post(
+            url,
+            data='List-Unsubscribe=One-Click',
+            headers={
+                'Content-Type': 'application/x-www-form-urlencoded',
+                'User-Agent': 'Gmail-Unsubscribe-Client/1.0'
+            }
+        )
+
     last_error = "Unknown error"
 
     for attempt in range(max_retries + 1):
         try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-                response = await client.post(
-                    url,
-                    data='List-Unsubscribe=One-Click',
-                    headers={
-                        'Content-Type': 'application/x-www-form-urlencoded',
-                        'User-Agent': 'Gmail-Unsubscribe-Client/1.0'
-                    }
-                )
+            if client is not None:
+                response = await post(client)
+            else:
+                async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as own_client:
+                    response = await post(own_client)
 
             # Success codes: 200, 202 (accepted), 204 (no content)
             if response.status_code in [200, 202, 204]:
@@ -165,9 +254,113 @@ async def async_one_click_unsubscribe(
     return False, last_error
 
 
-async def send_unsubscribe_email(mailto: str, gmail_service) -> tuple[bool, str]:
+def find_unsubscribe_form(html: str, base_url: str) -> Optional[tuple[str, str, dict]]:
     """
-    Send an unsubscribe email using Gmail API.
+    Find the form on an unsubscribe page whose submit control reads like
+    unsubscribe/confirm/opt-out.
+
+    Returns:
+        Tuple of (method, absolute action URL, form data), or None
+    """
+    from urllib.parse import urljoin
+
+    soup = BeautifulSoup(html, 'lxml')
+    for form in soup.find_all('form'):
+        submit = None
+        for control in form.find_all(['button', 'input']):
+            if control.name == 'input' and control.get('type', '').lower() not in ('submit', 'button', 'image'):
+                continue
+            label = control.get_text(' ', strip=True) if control.name == 'button' else control.get('value', '')
+            if UNSUBSCRIBE_CONTROL_PATTERN.search(label or ''):
+                submit = control
+                break
+        if submit is None:
+            continue
+
+        data = {}
+        for field_tag in form.find_all(['input', 'select', 'textarea']):
+            name = field_tag.get('name')
+            if not name or field_tag.has_attr('disabled'):
+                continue
+            if field_tag.name == 'select':
+                option = field_tag.find('option', selected=True) or field_tag.find('option')
+                if option is not None:
+                    data[name] = option.get('value', option.get_text(strip=True))
+            elif field_tag.name == 'textarea':
+                data[name] = field_tag.get_text()
+            else:
+                kind = field_tag.get('type', 'text').lower()
+                if kind in ('submit', 'button', 'image', 'reset', 'file'):
+                    continue
+                if kind in ('checkbox', 'radio') and not field_tag.has_attr('checked'):
+                    continue
+                data[name] = field_tag.get('value', 'on' if kind in ('checkbox', 'radio') else '')
+        if submit.get('name'):
+            data[submit['name']] = submit.get('value', '')
+
+        method = (form.get('method') or 'get').lower()
+        return method, urljoin(base_url, form.get('action') or ''), data
+
+    return None
+
+
+async def async_form_unsubscribe(
+    url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    timeout: int = 10
+) -> tuple[bool, str]:
+    """
+    Unsubscribe via a plain HTML page without a browser: fetch the page,
+    find its unsubscribe/confirm form and submit it directly.
+
+    Fails (so the caller can fall back to a real browser) when the page is
+    too large, isn't HTML, or has no matching form - i.e. likely needs JS.
+
+    Returns:
+        Tuple of (success: bool, message: str)
+    """
+    own_client = None
+    if client is None:
+        own_client = client = httpx.AsyncClient(timeout=timeout, follow_redirects=True)
+
+    try:
+        response = await client.get(url, headers={'User-Agent': 'Gmail-Unsubscribe-Client/1.0'})
+        if response.status_code >= 400:
+            return False, f"HTTP {response.status_code}"
+        if 'html' not in response.headers.get('content-type', ''):
+            return False, "Not an HTML page"
+        if len(response.content) > MAX_FORM_PAGE_BYTES:
+            return False, "Page too large"
+
+        html = response.text
+        form = find_unsubscribe_form(html, str(response.url))
+        if form is None:
+            # Some links unsubscribe on GET and just show a confirmation
+            if UNSUBSCRIBED_TEXT_PATTERN.search(html):
+                return True, "Unsubscribed on page load"
+            return False, "No unsubscribe form"
+
+        method, action, data = form
+        if method == 'post':
+            submitted = await client.post(action, data=data)
+        else:
+            submitted = await client.get(action, params=data)
+        if submitted.status_code >= 400:
+            return False, f"Form HTTP {submitted.status_code}"
+        return True, f"Form submitted (HTTP {submitted.status_code})"
+
+    except httpx.TimeoutException:
+        return False, "Timeout"
+    except httpx.RequestError as e:
+        return False, str(e)[:50]
+    finally:
+        if own_client is not None:
+            await own_client.aclose()
+
+
+def send_unsubscribe_email(mailto: str, gmail_service) -> tuple[bool, str]:
+    """
+    Send an unsubscribe email using Gmail API (blocking; run off the event loop).
 
     Args:
         mailto: The mailto string (e.g., "unsubscribe@example.com?subject=Unsubscribe")
@@ -216,6 +409,7 @@ class GmailClient:
     def __init__(self):
         self.service = None
         self._creds = None
+        self._local = threading.local()
 
     def authenticate(self) -> bool:
         """
@@ -252,9 +446,30 @@ class GmailClient:
                 token.write(creds.to_json())
 
         self._creds = creds
-        self.service = build('gmail', 'v1', credentials=creds)
+        self.service = build(
+            'gmail', 'v1',
+            credentials=creds,
+            requestBuilder=self._build_request
+        )
         return True
 
+    def _build_request(self, http, *args, **kwargs) -> HttpRequest:
+        """Bind each API request to this thread's HTTP connection.
+
+        httplib2 connections aren't thread-safe, so callers using the
+        service from worker threads each get their own.
+        """
+        return HttpRequest(self._thread_http(), *args, **kwargs)
+
+    def _thread_http(self) -> AuthorizedHttp:
+        """Get (or create) the authorized HTTP connection for this thread."""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            # build_http keeps the client library's default socket timeout
+            http = AuthorizedHttp(self._creds, http=build_http())
+            self._local.http = http
+        return http
+
     def get_emails(
         self,
         query: str = '',
@@ -277,12 +492,24 @@ class GmailClient:
         messages = results.get('messages', [])
         next_page = results.get('nextPageToken')
 
+        if not messages:
+            return [], next_page
+
+        # Batched HTTP round-trips for the page instead of one per message
+        responses = self._batch_requests(
+            [msg['id'] for msg in messages],
+            self._metadata_request
+        )
+
         emails = []
         for msg in messages:
-            email = self._fetch_email_metadata(msg['id'])
-            if email:
-                emails.append(email)
-
+            response = responses.get(msg['id'])
+            if response is None:
+                continue
+            try:
+                emails.append(self._parse_message(response, include_body=False))
+            except Exception:
+                pass
         return emails, next_page
 
     def get_email(self, email_id: str, include_body: bool = True) -> Optional[Email]:
@@ -306,71 +533,114 @@ class GmailClient:
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
 
-        deleted = 0
-        for email_id in email_ids:
-            try:
-                self.service.users().messages().trash(
-                    userId='me',
-                    id=email_id
-                ).execute()
-                deleted += 1
-            except Exception:
-                pass
-
-        return deleted
+        messages = self.service.users().messages()
+        return len(self._batch_requests(
+            email_ids,
+            lambda email_id: messages.trash(userId='me', id=email_id)
+        ))
 
     def archive_emails(self, email_ids: list[str]) -> int:
         """Archive emails (remove INBOX label)."""
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
 
-        archived = 0
-        for email_id in email_ids:
-            try:
-                self.service.users().messages().modify(
-                    userId='me',
-                    id=email_id,
-                    body={'removeLabelIds': ['INBOX']}
-                ).execute()
-                archived += 1
-            except Exception:
-                pass
-
-        return archived
+        return self._batch_modify(email_ids, remove_labels=['INBOX'])
 
     def mark_as_read(self, email_ids: list[str]) -> int:
         """Mark emails as read."""
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
 
+        return self._batch_modify(email_ids, remove_labels=['UNREAD'])
+
+    def _batch_modify(
+        self,
+        email_ids: list[str],
+        add_labels: Optional[list[str]] = None,
+        remove_labels: Optional[list[str]] = None
+    ) -> int:
+        """Change labels on many emails with one batchModify call per 1000 IDs."""
         count = 0
-        for email_id in email_ids:
+        for i in range(0, len(email_ids), BATCH_MODIFY_LIMIT):
+            chunk = email_ids[i:i + BATCH_MODIFY_LIMIT]
+            body = {'ids': chunk}
+            if add_labels:
+                body['addLabelIds'] = add_labels
+            if remove_labels:
+                body['removeLabelIds'] = remove_labels
             try:
-                self.service.users().messages().modify(
+                self.service.users().messages().batchModify(
                     userId='me',
-                    id=email_id,
-                    body={'removeLabelIds': ['UNREAD']}
+                    body=body
                 ).execute()
-                count += 1
+                count += len(chunk)
             except Exception:
                 pass
 
         return count
 
+    def _batch_requests(
+        self,
+        email_ids: list[str],
+        build_request: Callable[[str], HttpRequest]
+    ) -> dict[str, dict]:
+        """
+        Run one request per email in HTTP batches of BATCH_REQUEST_LIMIT.
+
+        Rate-limited or transiently failed requests are re-batched with
+        exponential backoff. Returns the successful responses by email ID.
+        """
+        responses: dict[str, dict] = {}
+        pending = list(dict.fromkeys(email_ids))
+
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(BATCH_RETRY_DELAY * 2 ** (attempt - 1))
+            retry: list[str] = []
+
+            def on_response(request_id, response, exception):
+                if exception is None:
+                    responses[request_id] = response
+                elif _is_retryable(exception):
+                    retry.append(request_id)
+
+            for i in range(0, len(pending), BATCH_REQUEST_LIMIT):
+                chunk = pending[i:i + BATCH_REQUEST_LIMIT]
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for email_id in chunk:
+                    batch.add(build_request(email_id), request_id=email_id)
+                try:
+                    batch.execute()
+                except Exception as e:
+                    if not _is_retryable(e):
+                        raise
+                    retry.extend(email_id for email_id in chunk if email_id not in responses)
+
+            pending = retry
+            if not pending:
+                break
+
+        if pending:
+            print(f"Gmail batch: {len(pending)} requests still rate-limited after retries")
+        return responses
+
     def _fetch_email_metadata(self, email_id: str) -> Optional[Email]:
         """Fetch email metadata (without full body)."""
         try:
-            msg = self.service.users().messages().get(
-                userId='me',
-                id=email_id,
-                format='metadata',
-                metadataHeaders=['From', 'Subject', 'Date', 'List-Unsubscribe', 'List-Unsubscribe-Post']
-            ).execute()
-
+            msg = self._metadata_request(email_id).execute()
             return self._parse_message(msg, include_body=False)
         except Exception:
             return None
 
+    def _metadata_request(self, email_id: str) -> HttpRequest:
+        """Build the metadata-only get request for one message."""
+        return self.service.users().messages().get(
+            userId='me',
+            id=email_id,
+            format='metadata',
+            metadataHeaders=METADATA_HEADERS
+        )
+
     def _parse_message(self, msg: dict, include_body: bool = False) -> Email:
         """Parse Gmail API message into Email object."""
         headers = {h['name']: h['value'] for h in msg.get('payload', {}).get('headers', [])}
@@ -385,8 +655,7 @@ class GmailClient:
 
         # Get unsubscribe URL and mailto from header
         list_unsub_header = headers.get('List-Unsubscribe', '')
-        unsub_url = self._extract_unsubscribe_url(list_unsub_header)
-        unsub_mailto = self._extract_unsubscribe_mailto(list_unsub_header)
+        unsub_url, unsub_mailto = _parse_unsubscribe_header(list_unsub_header)
 
         # Check for one-click unsubscribe support (RFC 8058)
         unsub_post = 'List-Unsubscribe-Post' in headers and unsub_url is not None
@@ -420,11 +689,11 @@ class GmailClient:
 
     def _parse_sender(self, sender: str) -> tuple[str, str]:
         """Parse sender into name and email."""
-        match = re.match(r'^"?([^"<]+)"?\s*<([^>]+)>', sender)
+        match = SENDER_PATTERN.match(sender)
         if match:
             return match.group(1).strip(), match.group(2).strip()
 
-        email_match = re.search(r'[\w\.-]+@[\w\.-]+', sender)
+        email_match = EMAIL_ADDRESS_PATTERN.search(sender)
         if email_match:
             email = email_match.group(0)
             name = email.split('@')[0].replace('.', ' ').replace('_', ' ').title()
@@ -434,53 +703,64 @@ class GmailClient:
 
     def _parse_date(self, date_str: str) -> datetime:
         """Parse email date string."""
-        from email.utils import parsedate_to_datetime
-        try:
-            return parsedate_to_datetime(date_str)
-        except Exception:
-            return datetime.now()
+        parsed = _try_parse_date(date_str)
+        return parsed if parsed is not None else datetime.now()
 
     def _extract_unsubscribe_url(self, header: str) -> Optional[str]:
         """Extract HTTP URL from List-Unsubscribe header."""
-        if not header:
-            return None
-        urls = re.findall(r'<(https?://[^>]+)>', header)
-        return urls[0] if urls else None
+        return _parse_unsubscribe_header(header)[0]
 
     def _extract_unsubscribe_mailto(self, header: str) -> Optional[str]:
         """Extract mailto: address from List-Unsubscribe header."""
-        if not header:
-            return None
-        # Match mailto: links like <mailto:unsubscribe@example.com> or <mailto:unsub@example.com?subject=unsubscribe>
-        mailtos = re.findall(r'<mailto:([^>]+)>', header)
-        return mailtos[0] if mailtos else None
+        return _parse_unsubscribe_header(header)[1]
 
     def _decode_body(self, payload: dict) -> tuple[Optional[str], Optional[str]]:
         """Decode email body from payload."""
         html_body = None
         text_body = None
 
-        def extract_parts(part):
-            nonlocal html_body, text_body
-
+        # Depth-first walk in document order; stop once both bodies are found
+        stack = [payload]
+        while stack:
+            part = stack.pop()
             mime_type = part.get('mimeType', '')
-            data = part.get('body', {}).get('data')
-
-            if data:
-                decoded = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-                if mime_type == 'text/html':
-                    html_body = decoded
-                elif mime_type == 'text/plain':
-                    text_body = decoded
 
-            for sub_part in part.get('parts', []):
-                extract_parts(sub_part)
+            # Only decode the parts we keep, never attachments
+            if (mime_type == 'text/html' and html_body is None) or \
+                    (mime_type == 'text/plain' and text_body is None):
+                data = part.get('body', {}).get('data')
+                if data:
+                    decoded = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+                    if mime_type == 'text/html':
+                        html_body = decoded
+                    else:
+                        text_body = decoded
+                    if html_body is not None and text_body is not None:
+                        break
+
+            stack.extend(reversed(part.get('parts', ())))
 
-        extract_parts(payload)
         return html_body, text_body
 
     def _extract_unsubscribe_from_body(self, html: str) -> Optional[str]:
         """Find unsubscribe link in HTML body."""
+        # No href attribute means no link to find
+        if not HREF_PATTERN.search(html):
+            return None
+
+        # Linear regex scan of the anchors first
+        for match in ANCHOR_PATTERN.finditer(html):
+            href = unescape(match.group(1) or match.group(2) or match.group(3) or '').strip()
+            if not href.startswith('http'):
+                continue
+            text = unescape(TAG_PATTERN.sub('', match.group(4))).lower()
+            if any(word in text for word in ['unsubscribe', 'opt out', 'opt-out']):
+                return href
+            if 'unsubscribe' in href.lower():
+                return href
+
+        # Nothing matched: parse the full document in case the regex misread
+        # markup (e.g. nested anchors or a '>' inside an attribute)
         soup = BeautifulSoup(html, 'lxml')
 
         for link in soup.find_all('a', href=True):
@@ -21,22 +21,38 @@ import sys
 import base64
 import email
 import time
+import heapq
 import argparse
+import tempfile
+import threading
+from contextlib import ExitStack
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from html import unescape
+from operator import itemgetter
+from urllib.parse import urlsplit
 from pathlib import Path
 
 # Fix Windows console encoding for Unicode
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from dataclasses import dataclass
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from bs4 import BeautifulSoup
 
+# Optional faster HTML parser for the full-parse fallback
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
 # Gmail API scope - read-only for safety
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
@@ -46,6 +62,51 @@ CREDENTIALS_FILE = PROJECT_DIR / 'credentials.json'
 TOKEN_FILE = PROJECT_DIR / 'token.json'
 OUTPUT_CSV = PROJECT_DIR / 'unsubscribe_links.csv'
 
+# Messages per HTTP batch. Gmail accepts 100, but larger batches tend to
+# get some sub-requests rate-limited (429); Google advises 50 or fewer
+BATCH_SIZE = 50
+
+# Rate-limited messages are re-batched up to this many times, backing off
+BATCH_MAX_RETRIES = 4
+BATCH_RETRY_DELAY = 1.0
+
+# Bodies sent to each body-scan worker process per task
+BODY_SCAN_CHUNK = 16
+
+# Links sorted in memory at a time when saving the CSV; longer outputs are
+# sorted in runs of this size, spilled to temporary files and merged
+CSV_SORT_RUN = 100_000
+
+# Header parsing patterns, compiled once since they run for every message
+SENDER_NAME_PATTERN = re.compile(r'^"?([^"<]+)"?\s*<')
+SENDER_DOMAIN_PATTERN = re.compile(r'@([^.]+)')
+UNSUB_URL_PATTERN = re.compile(r'<(https?://[^>]+)>')
+
+# Body link scan over the raw body bytes: anchors with a double-quoted,
+# single-quoted or unquoted href, and their inner HTML
+ANCHOR_PATTERN = re.compile(
+    rb'<a\s[^>]*?\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))[^>]*>(.*?)</a\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+TAG_PATTERN = re.compile(rb'<[^>]+>')
+# Case-insensitive, so the body is never lowercased into a copy
+HREF_PATTERN = re.compile(rb'href', re.IGNORECASE)
+# Link-text keywords ('unsubscribe', 'opt out', 'opt-out', 'remove') as one
+# alternation, so each link's text is scanned once rather than once per word
+UNSUBSCRIBE_TEXT_PATTERN = re.compile(r'unsubscribe|opt[ -]out|remove', re.IGNORECASE)
+
+# Common unsubscribe button patterns, as one XPath union so each page needs a
+# single find_elements round-trip (matches come back in document order)
+BUTTON_XPATH = " | ".join([
+    "//button[contains(translate(., 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
+    "//input[@type='submit'][contains(translate(@value, 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
+    "//a[contains(translate(., 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
+    "//button[contains(translate(., 'CONFIRM', 'confirm'), 'confirm')]",
+    "//input[@type='submit'][contains(translate(@value, 'CONFIRM', 'confirm'), 'confirm')]",
+    "//button[contains(translate(., 'OPT OUT', 'opt out'), 'opt out')]",
+    "//button[contains(translate(., 'REMOVE', 'remove'), 'remove')]",
+])
+
 
 @dataclass
 class UnsubscribeLink:
@@ -106,7 +167,8 @@ def get_promotions_emails(service, max_results: int = 500):
         max_results: Maximum number of emails to fetch
 
     Yields:
-        Message objects with full content
+        Message objects: headers only when List-Unsubscribe has a URL,
+        otherwise full content for the body fallback
     """
     print(f"Searching for Promotions emails (max {max_results})...")
 
@@ -133,31 +195,109 @@ def get_promotions_emails(service, max_results: int = 500):
         if not page_token:
             break
 
-    print(f"Fetching full content for {len(messages)} emails...")
+    print(f"Fetching headers for {len(messages)} emails...")
+
+    # One HTTP batch round-trip per BATCH_SIZE messages instead of one per message.
+    # Headers first; only download full bodies where the header has no link.
+    for start in range(0, len(messages), BATCH_SIZE):
+        chunk = [msg['id'] for msg in messages[start:start + BATCH_SIZE]]
+        print(f"  Processing {start + len(chunk)}/{len(messages)}...")
+
+        need_body = []
+        for msg in batch_get_messages(
+            service, chunk,
+            format='metadata',
+            metadataHeaders=['From', 'List-Unsubscribe'],
+            fields='id,payload/headers'
+        ):
+            if extract_unsubscribe_from_header(msg.get('payload', {}).get('headers', [])):
+                yield msg
+            else:
+                need_body.append(msg['id'])
+
+        if need_body:
+            for full_msg in batch_get_messages(
+                service, need_body, format='full', fields='id,payload'
+            ):
+                yield full_msg
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for Gmail errors worth retrying: rate limits and transient 5xx."""
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 403:
+        return b'ateLimitExceeded' in (error.content or b'')
+    return error.resp.status in (429, 500, 502, 503, 504)
+
+
+def batch_get_messages(service, message_ids: list[str], **params) -> list[dict]:
+    """
+    Get up to BATCH_SIZE messages in one batch request, in the given order.
 
-    for i, msg in enumerate(messages, 1):
-        if i % 50 == 0:
-            print(f"  Processing {i}/{len(messages)}...")
+    Rate-limited messages are retried in a new batch with exponential
+    backoff; other failures are skipped. If the batch call itself fails,
+    the messages are fetched one by one instead.
+    """
+    responses = {}
+    errors = {}
+    pending = list(message_ids)
+
+    for attempt in range(BATCH_MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(BATCH_RETRY_DELAY * 2 ** (attempt - 1))
+        retry = []
+
+        def on_response(request_id, response, exception):
+            if exception is None:
+                responses[request_id] = response
+            elif is_retryable(exception):
+                errors[request_id] = exception
+                retry.append(request_id)
+            else:
+                print(f"  Skipping {request_id}: {str(exception)[:50]}")
+
+        batch = service.new_batch_http_request(callback=on_response)
+        for message_id in pending:
+            batch.add(
+                service.users().messages().get(userId='me', id=message_id, **params),
+                request_id=message_id
+            )
 
-        # Get full message content
-        full_msg = service.users().messages().get(
-            userId='me',
-            id=msg['id'],
-            format='full'
-        ).execute()
+        try:
+            batch.execute()
+        except HttpError as e:
+            print(f"  Batch request failed ({str(e)[:50]}), fetching individually...")
+            for message_id in pending:
+                if message_id in responses:
+                    continue
+                try:
+                    responses[message_id] = service.users().messages().get(
+                        userId='me', id=message_id, **params
+                    ).execute(num_retries=BATCH_MAX_RETRIES)
+                except HttpError as e:
+                    print(f"  Skipping {message_id}: {str(e)[:50]}")
+            retry = []
+
+        pending = retry
+        if not pending:
+            break
+
+    for message_id in pending:
+        print(f"  Skipping {message_id}: {str(errors[message_id])[:50]}")
 
-        yield full_msg
+    return [responses[mid] for mid in message_ids if mid in responses]
 
 
 def extract_from_header(sender: str) -> str:
     """Extract company name from email sender."""
     # Format: "Company Name <email@example.com>" or just "email@example.com"
-    match = re.match(r'^"?([^"<]+)"?\s*<', sender)
+    match = SENDER_NAME_PATTERN.match(sender)
     if match:
         return match.group(1).strip()
 
     # Try to extract from email domain
-    match = re.search(r'@([^.]+)', sender)
+    match = SENDER_DOMAIN_PATTERN.search(sender)
     if match:
         return match.group(1).capitalize()
 
@@ -184,37 +324,52 @@ def extract_unsubscribe_from_header(headers: list) -> Optional[str]:
         return None
 
     # Find HTTP(S) URLs in the header
-    urls = re.findall(r'<(https?://[^>]+)>', unsub_header)
-    if urls:
-        return urls[0]
-
+    match = UNSUB_URL_PATTERN.search(unsub_header)
+    return match.group(1) if match else None
+
+
+def find_html_data(payload: dict) -> Optional[str]:
+    """Find the base64 data of the first text/html part, without decoding."""
+    for part in payload.get('parts', []):
+        if part.get('mimeType', '') == 'text/html':
+            data = part.get('body', {}).get('data')
+            if data:
+                return data
+        elif 'parts' in part:
+            # Nested multipart
+            data = find_html_data(part)
+            if data:
+                return data
     return None
 
 
-def decode_body(payload: dict) -> str:
-    """Decode email body from base64."""
-    body = ""
-
-    if 'body' in payload and payload['body'].get('data'):
-        body = base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='ignore')
+def decode_body(payload: dict) -> bytes:
+    """
+    Decode the email's HTML body (or its single-part body) from base64.
 
-    if 'parts' in payload:
-        for part in payload['parts']:
-            mime_type = part.get('mimeType', '')
-            if mime_type == 'text/html':
-                if part.get('body', {}).get('data'):
-                    body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
-                    break
-            elif 'parts' in part:
-                # Nested multipart
-                body = decode_body(part)
-                if body:
-                    break
+    Only the chosen part is decoded. The raw bytes are returned since the
+    link scan works on bytes and never needs the full text.
+    """
+    data = find_html_data(payload) or payload.get('body', {}).get('data')
+    if not data:
+        return b''
+    return base64.urlsafe_b64decode(data)
+
+
+def parse_links(html_body: bytes) -> Iterator[tuple[str, str]]:
+    """Yield (href, text) for every link, parsing the full HTML document."""
+    if HTMLParser is not None:
+        # selectolax walks the DOM in C; much faster than BeautifulSoup
+        for node in HTMLParser(html_body).css('a[href]'):
+            yield node.attributes.get('href') or '', node.text(deep=True)
+        return
 
-    return body
+    soup = BeautifulSoup(html_body, 'lxml')
+    for link in soup.find_all('a', href=True):
+        yield link.get('href', ''), link.get_text()
 
 
-def extract_unsubscribe_from_body(html_body: str) -> Optional[str]:
+def extract_unsubscribe_from_body(html_body: bytes) -> Optional[str]:
     """
     Extract unsubscribe URL from email HTML body.
 
@@ -223,15 +378,37 @@ def extract_unsubscribe_from_body(html_body: str) -> Optional[str]:
     if not html_body:
         return None
 
-    soup = BeautifulSoup(html_body, 'lxml')
-
-    # Find all links
-    for link in soup.find_all('a', href=True):
-        href = link.get('href', '')
-        text = link.get_text().lower()
+    # A body with no href attribute has no link to find; keywords themselves
+    # can't be checked this early since tags or entities may split them
+    if not HREF_PATTERN.search(html_body):
+        return None
 
+    # Linear regex scan of the anchors first
+    for match in ANCHOR_PATTERN.finditer(html_body):
+        raw_href = match.group(1) or match.group(2) or match.group(3) or b''
+        href = unescape(raw_href.decode('utf-8', errors='ignore')).strip()
+        if not href.startswith('http'):
+            continue
+        # Only the short link text is decoded, never the whole body
+        text = unescape(TAG_PATTERN.sub(b'', match.group(4)).decode('utf-8', errors='ignore'))
+        if UNSUBSCRIBE_TEXT_PATTERN.search(text):
+            return href
+        if 'unsubscribe' in href.lower():
+            return href
+
+    # Nothing matched: parse the full document in case the regex misread
+    # markup (e.g. nested anchors or a '>' inside an attribute). Skip the
+    # parse when no keyword appears either in the markup (e.g. in a URL) or
+    # in the text with tags and entities removed, where it can't match
+    markup = unescape(html_body.decode('utf-8', errors='ignore'))
+    if not UNSUBSCRIBE_TEXT_PATTERN.search(markup):
+        text = unescape(TAG_PATTERN.sub(b'', html_body).decode('utf-8', errors='ignore'))
+        if not UNSUBSCRIBE_TEXT_PATTERN.search(text):
+            return None
+
+    for href, text in parse_links(html_body):
         # Check if link text or URL contains unsubscribe indicators
-        if any(word in text for word in ['unsubscribe', 'opt out', 'opt-out', 'remove']):
+        if UNSUBSCRIBE_TEXT_PATTERN.search(text):
             if href.startswith('http'):
                 return href
 
@@ -242,84 +419,165 @@ def extract_unsubscribe_from_body(html_body: str) -> Optional[str]:
     return None
 
 
-def extract_unsubscribe_links(service, max_emails: int = 500) -> list[UnsubscribeLink]:
+def canonical_link_key(url: str, company: str) -> tuple:
     """
-    Extract unsubscribe links from Promotions emails.
+    Dedupe key for an unsubscribe link: scheme, host and path per sender.
 
-    Returns:
-        List of UnsubscribeLink objects
+    Senders put per-email tracking tokens in the query string, so exact
+    URLs rarely repeat. The sender stays in the key because mailing
+    services share one unsubscribe path across all their customers.
     """
-    links = []
-    seen_urls = set()
-
-    for msg in get_promotions_emails(service, max_emails):
-        headers = msg.get('payload', {}).get('headers', [])
-
-        # Get sender info
-        sender = get_header_value(headers, 'From') or 'Unknown'
-        company = extract_from_header(sender)
+    parts = urlsplit(url)
+    return company, parts.scheme, parts.netloc.lower(), parts.path.rstrip('/')
 
-        # Try to get unsubscribe URL from header first (most reliable)
-        unsub_url = extract_unsubscribe_from_header(headers)
-        source = 'header'
 
-        # Fall back to parsing HTML body
-        if not unsub_url:
-            html_body = decode_body(msg.get('payload', {}))
-            unsub_url = extract_unsubscribe_from_body(html_body)
-            source = 'body'
+def extract_unsubscribe_from_payload(payload: dict) -> Optional[str]:
+    """Decode a message payload and find an unsubscribe link in its HTML body."""
+    return extract_unsubscribe_from_body(decode_body(payload))
 
-        if unsub_url and unsub_url not in seen_urls:
-            seen_urls.add(unsub_url)
-            links.append(UnsubscribeLink(
-                company_name=company,
-                unsubscribe_url=unsub_url,
-                source=source
-            ))
 
-    return links
+def extract_unsubscribe_links(service, max_emails: int = 500) -> Iterator[UnsubscribeLink]:
+    """
+    Extract unsubscribe links from Promotions emails.
 
+    Header links are taken on the main process. Messages that need their
+    body parsed are decoded and scanned in a process pool, BATCH_SIZE at
+    a time, since that work is CPU-bound.
 
-def save_to_csv(links: list[UnsubscribeLink], output_file: Path = OUTPUT_CSV):
-    """Save unsubscribe links to CSV file."""
-    print(f"\nSaving {len(links)} unique unsubscribe links to {output_file}...")
+    Yields:
+        Unique UnsubscribeLink objects as they are found
+    """
+    seen_urls = set()
+    pending = []  # (company, payload) awaiting a body scan
 
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Company Name', 'Unsubscribe URL', 'Source'])
+    def unique(company: str, unsub_url: Optional[str], source: str) -> Optional[UnsubscribeLink]:
+        if not unsub_url:
+            return None
+        key = canonical_link_key(unsub_url, company)
+        if key in seen_urls:
+            return None
+        seen_urls.add(key)
+        return UnsubscribeLink(
+            company_name=company,
+            unsubscribe_url=unsub_url,
+            source=source
+        )
+
+    # Worker processes are only started once there is a body to scan
+    with ProcessPoolExecutor() as pool:
+
+        def scan_pending() -> list[UnsubscribeLink]:
+            urls = pool.map(
+                extract_unsubscribe_from_payload,
+                [payload for _, payload in pending],
+                chunksize=BODY_SCAN_CHUNK
+            )
+            found = [unique(company, url, 'body') for (company, _), url in zip(pending, urls)]
+            pending.clear()
+            return [link for link in found if link]
+
+        for msg in get_promotions_emails(service, max_emails):
+            headers = msg.get('payload', {}).get('headers', [])
+
+            # Get sender info
+            sender = get_header_value(headers, 'From') or 'Unknown'
+            company = extract_from_header(sender)
+
+            # Try to get unsubscribe URL from header first (most reliable)
+            unsub_url = extract_unsubscribe_from_header(headers)
+            if unsub_url:
+                link = unique(company, unsub_url, 'header')
+                if link:
+                    yield link
+                continue
+
+            # Fall back to parsing HTML body
+            pending.append((company, msg.get('payload', {})))
+            if len(pending) >= BATCH_SIZE:
+                yield from scan_pending()
+
+        if pending:
+            yield from scan_pending()
+
+
+def save_to_csv(
+    links: Iterable[UnsubscribeLink],
+    output_file: Path = OUTPUT_CSV,
+    collect: Optional[list] = None
+) -> dict[str, int]:
+    """
+    Write unsubscribe links to a CSV file, sorted by company name.
 
-        for link in sorted(links, key=lambda x: x.company_name.lower()):
-            writer.writerow([link.company_name, link.unsubscribe_url, link.source])
+    At most CSV_SORT_RUN links are held at once; beyond that, sorted runs
+    go to temporary files and are merged into the output. Links are also
+    appended to `collect` when given (which does keep them all, for
+    --auto-unsubscribe). Returns counts by source.
+    """
+    print(f"Saving unsubscribe links to {output_file}...")
+    counts = {'header': 0, 'body': 0}
+
+    def keyed_rows():
+        for link in links:
+            counts[link.source] += 1
+            if collect is not None:
+                collect.append(link)
+            yield link.company_name.casefold(), link.company_name, link.unsubscribe_url, link.source
+
+    # Sort key computed once per link, so sorting only compares tuple fields
+    by_key = itemgetter(0)
+    pending = keyed_rows()
+
+    with ExitStack() as spills:
+        runs = []
+        rows = sorted(islice(pending, CSV_SORT_RUN), key=by_key)
+        while len(rows) == CSV_SORT_RUN:
+            spill = spills.enter_context(
+                tempfile.TemporaryFile('w+', newline='', encoding='utf-8')
+            )
+            csv.writer(spill).writerows(rows)
+            spill.seek(0)
+            runs.append(csv.reader(spill))
+            rows = sorted(islice(pending, CSV_SORT_RUN), key=by_key)
+        if runs:
+            # Earlier runs win ties, so equal companies keep discovery order
+            rows = heapq.merge(*runs, rows, key=by_key)
+
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Company Name', 'Unsubscribe URL', 'Source'])
+            writer.writerows(map(itemgetter(1, 2, 3), rows))
 
     print(f"Saved to {output_file}")
+    return counts
 
 
-def auto_unsubscribe(links: list[UnsubscribeLink], headless: bool = False):
+def auto_unsubscribe(links: list[UnsubscribeLink], headless: bool = False, workers: int = 4):
     """
     Automatically visit unsubscribe links and attempt to click unsubscribe buttons.
 
     Args:
         links: List of UnsubscribeLink objects
         headless: Run browser without visible window
+        workers: Number of Chrome windows visiting links in parallel
     """
     try:
         from selenium import webdriver
         from selenium.webdriver.chrome.service import Service
         from selenium.webdriver.chrome.options import Options
         from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
         from selenium.common.exceptions import TimeoutException, WebDriverException
         from webdriver_manager.chrome import ChromeDriverManager
     except ImportError:
         print("ERROR: Selenium not installed. Run: pip install selenium webdriver-manager")
         return
 
+    workers = max(1, min(workers, len(links)))
+
     print(f"\n{'='*60}")
     print("AUTO-UNSUBSCRIBE MODE")
     print(f"{'='*60}")
     print(f"Will attempt to unsubscribe from {len(links)} services")
-    print("This will open Chrome and visit each unsubscribe link.")
+    print(f"This will open {workers} Chrome window(s) and visit each unsubscribe link.")
     print("\nPress Ctrl+C at any time to stop.\n")
 
     # Setup Chrome
@@ -330,71 +588,81 @@ def auto_unsubscribe(links: list[UnsubscribeLink], headless: bool = False):
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--window-size=1920,1080')
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.implicitly_wait(5)
+    # Resolve chromedriver once; each driver gets its own Service (own port,
+    # and quit() stops only that driver's chromedriver process)
+    chromedriver_path = ChromeDriverManager().install()
+
+    # One driver per worker thread; WebDriver sessions aren't thread-safe
+    local = threading.local()
+    drivers = []
+    drivers_lock = threading.Lock()
+
+    def get_driver():
+        driver = getattr(local, 'driver', None)
+        if driver is None:
+            driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
+            # Element lookups wait for late-rendered buttons instead of a fixed sleep
+            driver.implicitly_wait(5)
+            local.driver = driver
+            with drivers_lock:
+                drivers.append(driver)
+        return driver
+
+    def process(i: int, link: UnsubscribeLink) -> tuple[str, list[str]]:
+        """Visit one link; returns (outcome, output lines) so output isn't interleaved."""
+        lines = [
+            f"\n[{i}/{len(links)}] {link.company_name}",
+            f"  URL: {link.unsubscribe_url[:70]}...",
+        ]
+        try:
+            driver = get_driver()
+            driver.get(link.unsubscribe_url)
+
+            # Try to find and click unsubscribe button (one lookup for all patterns)
+            for elem in driver.find_elements(By.XPATH, BUTTON_XPATH):
+                try:
+                    if elem.is_displayed() and elem.is_enabled():
+                        elem.click()
+                        lines.append("  ✓ Clicked unsubscribe button")
+                        time.sleep(2)  # Let the click's request go out before the next link
+                        return 'success', lines
+                except Exception:
+                    continue
+
+            lines.append("  ? Page loaded - manual action may be needed")
+            return 'skipped', lines
+
+        except TimeoutException:
+            lines.append("  ✗ Timeout loading page")
+        except WebDriverException as e:
+            lines.append(f"  ✗ Error: {str(e)[:50]}")
+        except Exception as e:
+            lines.append(f"  ✗ Unexpected error: {str(e)[:50]}")
+        return 'failed', lines
 
     results = {'success': 0, 'failed': 0, 'skipped': 0}
 
-    # Common unsubscribe button patterns
-    button_patterns = [
-        "//button[contains(translate(., 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
-        "//input[@type='submit'][contains(translate(@value, 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
-        "//a[contains(translate(., 'UNSUBSCRIBE', 'unsubscribe'), 'unsubscribe')]",
-        "//button[contains(translate(., 'CONFIRM', 'confirm'), 'confirm')]",
-        "//input[@type='submit'][contains(translate(@value, 'CONFIRM', 'confirm'), 'confirm')]",
-        "//button[contains(translate(., 'OPT OUT', 'opt out'), 'opt out')]",
-        "//button[contains(translate(., 'REMOVE', 'remove'), 'remove')]",
-    ]
-
+    executor = ThreadPoolExecutor(max_workers=workers)
     try:
-        for i, link in enumerate(links, 1):
-            print(f"\n[{i}/{len(links)}] {link.company_name}")
-            print(f"  URL: {link.unsubscribe_url[:70]}...")
-
-            try:
-                driver.get(link.unsubscribe_url)
-                time.sleep(2)  # Wait for page load
-
-                # Try to find and click unsubscribe button
-                clicked = False
-                for pattern in button_patterns:
-                    try:
-                        elements = driver.find_elements(By.XPATH, pattern)
-                        for elem in elements:
-                            if elem.is_displayed() and elem.is_enabled():
-                                elem.click()
-                                clicked = True
-                                print(f"  ✓ Clicked unsubscribe button")
-                                results['success'] += 1
-                                time.sleep(2)
-                                break
-                    except Exception:
-                        continue
-                    if clicked:
-                        break
-
-                if not clicked:
-                    print(f"  ? Page loaded - manual action may be needed")
-                    results['skipped'] += 1
-
-            except TimeoutException:
-                print(f"  ✗ Timeout loading page")
-                results['failed'] += 1
-            except WebDriverException as e:
-                print(f"  ✗ Error: {str(e)[:50]}")
-                results['failed'] += 1
-            except Exception as e:
-                print(f"  ✗ Unexpected error: {str(e)[:50]}")
-                results['failed'] += 1
-
-            # Small delay between requests
-            time.sleep(1)
+        futures = [
+            executor.submit(process, i, link)
+            for i, link in enumerate(links, 1)
+        ]
+        for future in as_completed(futures):
+            outcome, lines = future.result()
+            results[outcome] += 1
+            print('\n'.join(lines))
 
     except KeyboardInterrupt:
         print("\n\nStopped by user.")
     finally:
-        driver.quit()
+        executor.shutdown(wait=False, cancel_futures=True)
+        with drivers_lock:
+            for driver in drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
 
     print(f"\n{'='*60}")
     print("RESULTS")
@@ -419,6 +687,12 @@ def main():
         action='store_true',
         help='Automatically visit unsubscribe links with Selenium'
     )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=4,
+        help='Browser windows to run in parallel for auto-unsubscribe (default: 4)'
+    )
     parser.add_argument(
         '--headless',
         action='store_true',
@@ -448,30 +722,32 @@ def main():
     if not service:
         return 1
 
-    # Extract links
+    # Extract links, writing each to the CSV as it is found
     print("\n[2/3] Extracting unsubscribe links...")
-    links = extract_unsubscribe_links(service, args.max_emails)
+    links = [] if args.auto_unsubscribe else None
+    counts = save_to_csv(
+        extract_unsubscribe_links(service, args.max_emails),
+        Path(args.output),
+        collect=links
+    )
+    total = counts['header'] + counts['body']
 
-    if not links:
+    if not total:
         print("\nNo unsubscribe links found!")
         return 0
 
-    print(f"\nFound {len(links)} unique unsubscribe links:")
-    print(f"  - From headers: {sum(1 for l in links if l.source == 'header')}")
-    print(f"  - From body: {sum(1 for l in links if l.source == 'body')}")
-
-    # Save to CSV
-    print("\n[3/3] Saving results...")
-    save_to_csv(links, Path(args.output))
+    print(f"\n[3/3] Found {total} unique unsubscribe links:")
+    print(f"  - From headers: {counts['header']}")
+    print(f"  - From body: {counts['body']}")
 
     # Auto-unsubscribe if requested
     if args.auto_unsubscribe:
         if args.yes:
-            auto_unsubscribe(links, args.headless)
+            auto_unsubscribe(links, args.headless, args.workers)
         else:
             response = input("\nProceed with auto-unsubscribe? (y/N): ")
             if response.lower() == 'y':
-                auto_unsubscribe(links, args.headless)
+                auto_unsubscribe(links, args.headless, args.workers)
 
     print("\nDone!")
     return 0
@@ -7,15 +7,53 @@ Persists state to SQLite for resilience across restarts.
 
 import os
 import uuid
+import asyncio
 import aiosqlite
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field, asdict
 
 PROJECT_DIR = Path(__file__).parent
 DB_FILE = Path(os.getenv("DB_PATH", str(PROJECT_DIR / 'emails.db')))
 
+# Per-connection settings (WAL itself is set on the file by init_db). Writes
+# from EmailDatabase's connection wait up to busy_timeout for the lock
+SQLITE_BUSY_TIMEOUT_MS = 30000
+CONNECTION_PRAGMAS = f'''
+    PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS};
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+'''
+
+# Local ISO-8601 timestamp (as datetime.now().isoformat(), to the millisecond),
+# computed by SQLite so write paths don't build one in Python
+SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+# A job and its items in one round trip; item columns are prefixed since
+# both tables have id and status
+JOB_WITH_ITEMS_SQL = '''
+    SELECT j.*,
+        i.id AS item_id, i.sender AS item_sender, i.sender_email AS item_sender_email,
+        i.unsubscribe_url AS item_unsubscribe_url,
+        i.unsubscribe_mailto AS item_unsubscribe_mailto,
+        i.method_attempted AS item_method_attempted, i.status AS item_status,
+        i.error_message AS item_error_message, i.attempted_at AS item_attempted_at,
+        i.retry_count AS item_retry_count
+    FROM jobs j
+    LEFT JOIN job_items i ON i.job_id = j.id
+    WHERE {where}
+    ORDER BY i.id
+'''
+
+# Record an item's outcome; the job_items_status_au trigger (see
+# database.init_db) bumps the job's counters when it finishes
+UPDATE_ITEM_SQL = f'''
+    UPDATE job_items
+    SET status = ?, method_attempted = ?, error_message = ?, attempted_at = {SQL_NOW}
+    WHERE id = ?
+'''
+
 
 @dataclass
 class JobItem:
@@ -53,33 +91,74 @@ class JobManager:
 
     def __init__(self, db_path: str = None):
         self.db_path = db_path or str(DB_FILE)
+        # One long-lived connection; writes are serialized by the lock
+        self._db: Optional[aiosqlite.Connection] = None
+        self._open_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    async def open(self):
+        """Open the shared connection (idempotent; also done lazily on first use)."""
+        async with self._open_lock:
+            if self._db is not None:
+                return
+            db = await aiosqlite.connect(self.db_path)
+            await db.executescript(CONNECTION_PRAGMAS)
+            db.row_factory = aiosqlite.Row
+            self._db = db
+
+    async def close(self):
+        """Close the shared connection."""
+        async with self._open_lock:
+            if self._db is not None:
+                await self._db.close()
+            self._db = None
+
+    @asynccontextmanager
+    async def _connect(self, write: bool = False):
+        """
+        Yield the shared connection; with write=True it is held under the
+        write lock and rolled back if the block fails.
+        """
+        if self._db is None:
+            await self.open()
+        if not write:
+            yield self._db
+            return
+        async with self._write_lock:
+            try:
+                yield self._db
+            except BaseException:
+                await self._db.rollback()
+                raise
 
     async def create_job(self, items: list[dict]) -> Job:
         """Create a new job with items."""
         job_id = str(uuid.uuid4())
-        now = datetime.now().isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect(write=True) as db:
+            await db.execute('BEGIN IMMEDIATE')
             # Insert job
-            await db.execute('''
+            await db.execute(f'''
                 INSERT INTO jobs (id, status, created_at, total_items)
-                VALUES (?, ?, ?, ?)
-            ''', (job_id, 'pending', now, len(items)))
-
-            # Insert job items
-            for item in items:
-                await db.execute('''
-                    INSERT INTO job_items
-                    (job_id, sender, sender_email, unsubscribe_url, unsubscribe_mailto, status)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
+                VALUES (?, ?, {SQL_NOW}, ?)
+            ''', (job_id, 'pending', len(items)))
+
+            # Insert job items with one prepared statement
+            await db.executemany('''
+                INSERT INTO job_items
+                (job_id, sender, sender_email, unsubscribe_url, unsubscribe_mailto, status)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (
                     job_id,
                     item.get('sender', ''),
                     item.get('sender_email', ''),
                     item.get('url'),
                     item.get('mailto'),
                     'pending'
-                ))
+                )
+                for item in items
+            ])
 
             await db.commit()
 
@@ -87,17 +166,17 @@ class JobManager:
 
     async def get_job(self, job_id: str) -> Optional[Job]:
         """Get a job with all its items."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        return await self._get_job_where('j.id = ?', (job_id,))
 
-            # Get job
-            cursor = await db.execute(
-                'SELECT * FROM jobs WHERE id = ?', (job_id,)
-            )
-            row = await cursor.fetchone()
-            if not row:
+    async def _get_job_where(self, where: str, params: tuple) -> Optional[Job]:
+        """Load the first job matching `where` and its items in one query."""
+        async with self._connect() as db:
+            cursor = await db.execute(JOB_WITH_ITEMS_SQL.format(where=where), params)
+            rows = await cursor.fetchall()
+            if not rows:
                 return None
 
+            row = rows[0]
             job = Job(
                 id=row['id'],
                 status=row['status'],
@@ -110,36 +189,30 @@ class JobManager:
                 failed_items=row['failed_items']
             )
 
-            # Get items
-            cursor = await db.execute(
-                'SELECT * FROM job_items WHERE job_id = ? ORDER BY id',
-                (job_id,)
-            )
-            rows = await cursor.fetchall()
+            # A job without items yields one row with NULL item columns
             job.items = [
                 JobItem(
-                    id=r['id'],
-                    job_id=r['job_id'],
-                    sender=r['sender'],
-                    sender_email=r['sender_email'],
-                    unsubscribe_url=r['unsubscribe_url'],
-                    unsubscribe_mailto=r['unsubscribe_mailto'],
-                    method_attempted=r['method_attempted'],
-                    status=r['status'],
-                    error_message=r['error_message'],
-                    attempted_at=r['attempted_at'],
-                    retry_count=r['retry_count']
+                    id=r['item_id'],
+                    job_id=job.id,
+                    sender=r['item_sender'],
+                    sender_email=r['item_sender_email'],
+                    unsubscribe_url=r['item_unsubscribe_url'],
+                    unsubscribe_mailto=r['item_unsubscribe_mailto'],
+                    method_attempted=r['item_method_attempted'],
+                    status=r['item_status'],
+                    error_message=r['item_error_message'],
+                    attempted_at=r['item_attempted_at'],
+                    retry_count=r['item_retry_count']
                 )
                 for r in rows
+                if r['item_id'] is not None
             ]
 
             return job
 
     async def list_jobs(self, limit: int = 20, offset: int = 0) -> list[Job]:
         """List jobs ordered by creation date (newest first)."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-
+        async with self._connect() as db:
             cursor = await db.execute('''
                 SELECT * FROM jobs
                 ORDER BY created_at DESC
@@ -165,12 +238,11 @@ class JobManager:
 
     async def start_job(self, job_id: str) -> None:
         """Mark job as running."""
-        now = datetime.now().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('''
-                UPDATE jobs SET status = 'running', started_at = ?
+        async with self._connect(write=True) as db:
+            await db.execute(f'''
+                UPDATE jobs SET status = 'running', started_at = {SQL_NOW}
                 WHERE id = ?
-            ''', (now, job_id))
+            ''', (job_id,))
             await db.commit()
 
     async def update_item(
@@ -180,55 +252,45 @@ class JobManager:
         method: str,
         error_message: Optional[str] = None
     ) -> None:
-        """Update a job item's status."""
-        now = datetime.now().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('''
-                UPDATE job_items
-                SET status = ?, method_attempted = ?, error_message = ?, attempted_at = ?
-                WHERE id = ?
-            ''', (status, method, error_message, now, item_id))
-
-            # Get job_id to update counters
-            cursor = await db.execute(
-                'SELECT job_id FROM job_items WHERE id = ?', (item_id,)
-            )
-            row = await cursor.fetchone()
-            if row:
-                job_id = row[0]
-
-                # Update job counters
-                if status == 'success':
-                    await db.execute('''
-                        UPDATE jobs
-                        SET completed_items = completed_items + 1,
-                            successful_items = successful_items + 1
-                        WHERE id = ?
-                    ''', (job_id,))
-                elif status == 'failed':
-                    await db.execute('''
-                        UPDATE jobs
-                        SET completed_items = completed_items + 1,
-                            failed_items = failed_items + 1
-                        WHERE id = ?
-                    ''', (job_id,))
+        """Update a job item's status (job counters follow via trigger)."""
+        async with self._connect(write=True) as db:
+            await db.execute(UPDATE_ITEM_SQL, (status, method, error_message, item_id))
+            await db.commit()
 
+    async def update_items_bulk(
+        self,
+        job_id: str,
+        updates: list[tuple[int, str, str, Optional[str]]]
+    ) -> None:
+        """
+        Update many items of one job in a single transaction.
+
+        Each update is (item_id, status, method, error_message); the job
+        counters follow via trigger.
+        """
+        if not updates:
+            return
+
+        async with self._connect(write=True) as db:
+            await db.execute('BEGIN IMMEDIATE')
+            await db.executemany(UPDATE_ITEM_SQL, [
+                (status, method, error_message, item_id)
+                for item_id, status, method, error_message in updates
+            ])
             await db.commit()
 
     async def complete_job(self, job_id: str, status: str = 'completed') -> None:
         """Mark job as completed or failed."""
-        now = datetime.now().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('''
-                UPDATE jobs SET status = ?, completed_at = ?
+        async with self._connect(write=True) as db:
+            await db.execute(f'''
+                UPDATE jobs SET status = ?, completed_at = {SQL_NOW}
                 WHERE id = ?
-            ''', (status, now, job_id))
+            ''', (status, job_id))
             await db.commit()
 
     async def get_pending_items(self, job_id: str) -> list[JobItem]:
         """Get all pending items for a job."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connect() as db:
             cursor = await db.execute('''
                 SELECT * FROM job_items
                 WHERE job_id = ? AND status = 'pending'
@@ -255,8 +317,7 @@ class JobManager:
 
     async def get_failed_items(self, job_id: str) -> list[JobItem]:
         """Get all failed items for a job (for retry)."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connect() as db:
             cursor = await db.execute('''
                 SELECT * FROM job_items
                 WHERE job_id = ? AND status = 'failed'
@@ -283,7 +344,7 @@ class JobManager:
 
     async def reset_failed_items(self, job_id: str) -> int:
         """Reset failed items to pending for retry. Returns count."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect(write=True) as db:
             cursor = await db.execute('''
                 UPDATE job_items
                 SET status = 'pending', retry_count = retry_count + 1
@@ -306,37 +367,44 @@ class JobManager:
 
     async def get_active_job(self) -> Optional[Job]:
         """Get the currently running job, if any."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                "SELECT * FROM jobs WHERE status = 'running' LIMIT 1"
-            )
-            row = await cursor.fetchone()
-            if row:
-                return await self.get_job(row['id'])
-            return None
+        return await self._get_job_where(
+            "j.id = (SELECT id FROM jobs WHERE status = 'running' LIMIT 1)", ()
+        )
 
     async def get_job_status(self, job_id: str) -> dict:
         """Get job status in the format expected by the frontend."""
-        job = await self.get_job(job_id)
-        if not job:
-            return {"running": False, "progress": 0, "total": 0, "results": []}
+        # Polled often: read only the counters and finished items' fields,
+        # without building Job/JobItem objects
+        async with self._connect() as db:
+            cursor = await db.execute(
+                'SELECT status, completed_items, total_items FROM jobs WHERE id = ?',
+                (job_id,)
+            )
+            job = await cursor.fetchone()
+            if not job:
+                return {"running": False, "progress": 0, "total": 0, "results": []}
+
+            cursor = await db.execute('''
+                SELECT sender, status, method_attempted, error_message FROM job_items
+                WHERE job_id = ? AND status IN ('success', 'failed')
+                ORDER BY id
+            ''', (job_id,))
+            rows = await cursor.fetchall()
 
         results = [
             {
-                "sender": item.sender,
-                "success": item.status == "success",
-                "method": item.method_attempted or "pending",
-                "message": item.error_message or ("Done" if item.status == "success" else "")
+                "sender": r['sender'],
+                "success": r['status'] == "success",
+                "method": r['method_attempted'] or "pending",
+                "message": r['error_message'] or ("Done" if r['status'] == "success" else "")
             }
-            for item in job.items
-            if item.status in ("success", "failed")
+            for r in rows
         ]
 
         return {
-            "running": job.status == "running",
-            "progress": job.completed_items,
-            "total": job.total_items,
+            "running": job['status'] == "running",
+            "progress": job['completed_items'],
+            "total": job['total_items'],
             "results": results,
-            "job_id": job.id
+            "job_id": job_id
         }